@@ -0,0 +1,93 @@
+"""
+Filename: nonogram_batch.py
+Date Created: 10/18/2026
+
+Solves a batch of .puz files without the GUI, spread across a pool of processes. One JSON object is written per
+puzzle, one per line, as soon as that puzzle is finished. Give each puzzle a budget when the files are not trusted,
+so that one hard puzzle cannot hold a worker indefinitely:
+    python nonogram_batch.py "puzzles/*.puz" --timeout 10
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+from nonogram_board import NonogramBoard
+from nonogram_puzzle_file import iterPuzzleFiles, readPuzzleFile
+from nonogram_solver_registry import SEARCH_SOLVERS, createSolver
+
+
+def solutionRows(solution):
+    """
+    :param solution: boolean array of the filled cells of a solution
+    :return: the solution as one string per row, '#' for filled and '.' for empty
+    """
+    return ["".join("#" if filled else "." for filled in row) for row in solution]
+
+
+def solveFile(path, solverName="cached", maxSteps=None, maxTime=None):
+    """
+    Solves a single .puz file and classifies its solution, by searching for up to two solutions
+    :param path: path of the .puz file
+    :param solverName: key of SEARCH_SOLVERS. The default "cached" lets each worker reuse line results across puzzles.
+    :param maxSteps: give up after this many solver steps (None for no limit). The status is then "unknown".
+    :param maxTime: give up after this many seconds of searching (None for no limit). The status is then "unknown".
+    :return: dict describing the result, ready to be written as JSON
+    """
+    result = {"puzzle": path}
+    startTime = time.perf_counter()
+    try:
+        rowClues, colClues = readPuzzleFile(path)
+    except (OSError, ValueError) as e:
+        result["status"] = "error"
+        result["error"] = str(e)
+        return result
+
+    board = NonogramBoard.initFromClues(rowClues, colClues)
+    solver = createSolver(solverName, board)
+    solver.start(limit=2)
+    finished = solver.resume(maxSteps=maxSteps, maxTime=maxTime)
+    solutions = solver.solutions
+    numSolutions = len(solutions)
+
+    if finished:
+        result["status"] = ["unsolvable", "unique", "multiple"][numSolutions]
+    else:
+        result["status"] = "unknown"  # The search ran out of budget before it could tell
+    result["solution"] = solutionRows(solutions[0]) if solutions else None
+    if numSolutions > 1:
+        result["otherSolution"] = solutionRows(solutions[1])
+    result["steps"] = solver.numSteps
+    result["stats"] = solver.getStats().toDict()
+    result["time"] = time.perf_counter() - startTime
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve .puz files in parallel, writing one JSON result per line.")
+    parser.add_argument("paths", nargs="+", help=".puz files, directories of .puz files, or glob patterns")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of cores)")
+    parser.add_argument("--solver", choices=SEARCH_SOLVERS, default="cached", help="solver to use (default: cached)")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="give up on a puzzle after this many solver steps (default: no limit)")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="give up on a puzzle after searching for this many seconds (default: no limit)")
+    args = parser.parse_args(argv)
+
+    # The pool's feeder thread reads the whole listing ahead of the workers, so every path is queued up front. Only
+    # the results are streamed, each written as soon as its puzzle is finished.
+    puzzleFiles = iterPuzzleFiles(args.paths)
+    with Pool(processes=args.processes) as pool:
+        for result in pool.imap_unordered(partial(solveFile, solverName=args.solver, maxSteps=args.max_steps,
+                                                   maxTime=args.timeout), puzzleFiles, chunksize=16):
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
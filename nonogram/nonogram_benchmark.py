@@ -0,0 +1,172 @@
+"""
+Filename: nonogram_benchmark.py
+Date Created: 10/18/2026
+
+Benchmarks every solver strategy on the bundled puzzles. Results can be saved as a JSON baseline, and a later run can be
+compared against a saved baseline to flag regressions:
+    python nonogram_benchmark.py --output baseline.json
+    python nonogram_benchmark.py --compare baseline.json
+Solvers run on a NonogramBoard by default, or on a NonogramBitBoard with --board bit.
+"""
+
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_board import NonogramBoard
+from nonogram_puzzle_file import PUZZLE_DIR, readPuzzleFile
+from nonogram_solver_registry import NONDETERMINISTIC_SOLVERS, SOLVER_TYPES, createSolver
+
+# Board backends the solvers can be benchmarked on
+BOARD_TYPES = {"list": NonogramBoard, "bit": NonogramBitBoard}
+
+
+def runSolver(solverName, rowClues, colClues, boardName="list"):
+    """
+    Solves a puzzle once on a fresh board
+    :param boardName: key of BOARD_TYPES
+    :return: (seconds, solved, solver) for the solve
+    """
+    board = BOARD_TYPES[boardName].initFromClues(rowClues, colClues)
+    solver = createSolver(solverName, board)
+    startTime = time.perf_counter()
+    solved = solver.solvePuzzle()
+    return time.perf_counter() - startTime, solved, solver
+
+
+def benchmarkPuzzle(solverName, rowClues, colClues, trials, warmup, boardName="list"):
+    """
+    Times one solver on one puzzle. Peak memory is measured on a separate run, since tracing allocations slows the
+    solver down too much to time it at the same time.
+    :return: dict of measurements
+    """
+    for i in range(warmup):
+        runSolver(solverName, rowClues, colClues, boardName)
+
+    times = []
+    solved = False
+    solver = None
+    for i in range(trials):
+        seconds, solved, solver = runSolver(solverName, rowClues, colClues, boardName)
+        times.append(seconds)
+
+    tracemalloc.start()
+    runSolver(solverName, rowClues, colClues, boardName)
+    peakMemory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"solved": bool(solved),
+            "steps": solver.numSteps,
+            "backtracks": solver.numBacktracks,
+            "medianTime": statistics.median(times),
+            "minTime": min(times),
+            "meanTime": statistics.mean(times),
+            "peakMemory": peakMemory}
+
+
+def runBenchmarks(puzzleFiles, solverNames, trials, warmup, boardName="list"):
+    """
+    :return: the benchmark report, with results[solverName][puzzleName] holding the measurements
+    """
+    report = {"metadata": {"date": datetime.datetime.now().isoformat(timespec="seconds"),
+                           "python": platform.python_version(),
+                           "platform": platform.platform(),
+                           "trials": trials,
+                           "warmup": warmup,
+                           "board": boardName},
+              "results": {}}
+    for solverName in solverNames:
+        report["results"][solverName] = {}
+        for puzzleFile in puzzleFiles:
+            puzzleName = os.path.splitext(os.path.basename(puzzleFile))[0]
+            rowClues, colClues = readPuzzleFile(puzzleFile)
+            result = benchmarkPuzzle(solverName, rowClues, colClues, trials, warmup, boardName)
+            report["results"][solverName][puzzleName] = result
+            print("{:<14} {:<20} {:>10.4f}s {:>9} steps {:>8} backtracks {:>10} bytes".format(
+                solverName, puzzleName, result["medianTime"], result["steps"], result["backtracks"],
+                result["peakMemory"]))
+    return report
+
+
+def compareReports(baseline, report, threshold, minDelta=0.005):
+    """
+    Compares a benchmark report against a baseline. A result regresses if its median time grew by more than both the
+    threshold and minDelta, or if it now takes more steps or fails to solve a puzzle it used to solve. Requiring both
+    keeps timer noise on puzzles that solve in a few milliseconds from being flagged. Steps are not compared for
+    NONDETERMINISTIC_SOLVERS, since theirs change from run to run.
+    :param baseline: report loaded from a baseline file
+    :param report: report from this run
+    :param threshold: allowed fractional slowdown in median time, e.g. 0.1 for 10%
+    :param minDelta: allowed slowdown in median time in seconds, however large the ratio
+    :return: list of regression messages
+    """
+    regressions = []
+    for solverName, puzzles in report["results"].items():
+        for puzzleName, result in puzzles.items():
+            old = baseline["results"].get(solverName, {}).get(puzzleName)
+            if old is None:
+                continue
+            ratio = result["medianTime"] / old["medianTime"] if old["medianTime"] > 0 else 1.0
+            print("{:<14} {:<20} {:>7.2f}x time {:>+9} steps".format(
+                solverName, puzzleName, ratio, result["steps"] - old["steps"]))
+            if old["solved"] and not result["solved"]:
+                regressions.append(solverName + "/" + puzzleName + ": no longer solved")
+            if ratio > 1 + threshold and result["medianTime"] - old["medianTime"] > minDelta:
+                regressions.append(solverName + "/" + puzzleName + ": median time is {:.2f}x the baseline".format(ratio))
+            if result["steps"] > old["steps"] and solverName not in NONDETERMINISTIC_SOLVERS:
+                regressions.append(solverName + "/" + puzzleName + ": steps went from " + str(old["steps"]) +
+                                   " to " + str(result["steps"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the nonogram solvers on a directory of .puz files.")
+    parser.add_argument("--puzzles", default=PUZZLE_DIR, help="directory of .puz files (default: bundled puzzles)")
+    parser.add_argument("--solvers", nargs="+", choices=sorted(SOLVER_TYPES),
+                        default=sorted(name for name in SOLVER_TYPES if name not in NONDETERMINISTIC_SOLVERS),
+                        help="solver strategies to benchmark (default: all but " + ", ".join(NONDETERMINISTIC_SOLVERS) +
+                        ", whose step counts vary between runs)")
+    parser.add_argument("--trials", type=int, default=15,
+                        help="timed solves per puzzle, whose median is compared (default: 15)")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed solves before the trials (default: 1)")
+    parser.add_argument("--board", choices=sorted(BOARD_TYPES), default="list",
+                        help="board backend to solve on (default: list)")
+    parser.add_argument("--output", help="save the results to this JSON baseline file")
+    parser.add_argument("--compare", help="compare the results against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="fractional slowdown allowed before --compare flags a regression (default: 0.1)")
+    parser.add_argument("--min-delta", type=float, default=0.005,
+                        help="slowdown in seconds allowed before --compare flags a regression, whatever the fraction "
+                        "(default: 0.005)")
+    args = parser.parse_args(argv)
+    if args.trials < 1:
+        parser.error("--trials must be at least 1")
+
+    puzzleFiles = sorted(glob.glob(os.path.join(args.puzzles, "*.puz")))
+    report = runBenchmarks(puzzleFiles, args.solvers, args.trials, args.warmup, args.board)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        regressions = compareReports(baseline, report, args.threshold, args.min_delta)
+        for regression in regressions:
+            print("REGRESSION: " + regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,8 +3,47 @@ Filename: nonogram_board.py
 Date Created: 5/4/2021
 """
 
+from typing import TYPE_CHECKING
+
 import numpy as np
-from nonogram_tile_grid import NonogramTileGrid
+from nonogram_propagation_solver import NonogramPropagationSolver
+
+if TYPE_CHECKING:  # Only for annotations, so the headless tools can use boards without importing Tk
+    from nonogram_tile_grid import NonogramTileGrid
+
+
+def runLengthClues(lines):
+    """
+    Computes the clue of every line of a boolean array at once. Each line is padded with an unselected tile at both
+    ends, so that every run of selected tiles starts where the diff along the line is +1 and ends where it is -1.
+    :param lines: 2D boolean array, one line per row
+    :return: list of clues, one per line, each a list of run lengths or [0] for a line with no selected tiles
+    """
+    numLines, length = lines.shape
+    padded = np.zeros((numLines, length + 2), dtype=np.int8)
+    padded[:, 1:-1] = lines
+    edges = np.diff(padded, axis=1)
+    runLines, runStarts = np.nonzero(edges == 1)
+    runEnds = np.nonzero(edges == -1)[1]  # Runs never overlap, so the row-major order of the ends matches the starts
+    runLengths = (runEnds - runStarts).tolist()
+    splits = np.cumsum(np.bincount(runLines, minlength=numLines)).tolist()
+
+    clues = []
+    first = 0
+    for last in splits:
+        clues.append(runLengths[first:last] if last > first else [0])
+        first = last
+    return clues
+
+
+def cluesFromAnswerKey(answerKey):
+    """
+    Derives the row and column clues of a puzzle from its answer key
+    :param answerKey: boolean numpy array of size (rows, cols) indicating which tiles are selected
+    :return: (rowClues, colClues)
+    """
+    answerKey = np.asarray(answerKey, dtype=bool)
+    return runLengthClues(answerKey), runLengthClues(answerKey.T)
 
 
 class NonogramBoard:
@@ -16,6 +55,22 @@ class NonogramBoard:
         self.rowClues = None
         self.colClues = None
 
+        # Progress against the answer key, kept up to date by updateBoard once the answer key is known (see
+        # trackAnswerKey). A cell is a mismatch if it is marked "yes" but not in the answer key, or in the answer key
+        # but not marked "yes". It is an error if it is a mismatch and not unknown, i.e. the player marked it wrongly.
+        self.tracking = False
+        self.numMismatches = 0
+        self.numErrors = 0
+        self.rowMismatches = None
+        self.colMismatches = None
+        self.rowErrors = None
+        self.colErrors = None
+        self.wrongRows = set()  # Rows/cols with at least one error
+        self.wrongCols = set()
+
+        self.solutionSearch = None  # Result of findSolutions, kept until the clues change
+        self.clueVersion = 0  # Counts edits to the clues, so that a search of older clues is not kept
+
     @classmethod
     def initFromClues(cls, rowClues, colClues):
         """
@@ -28,14 +83,14 @@ class NonogramBoard:
         board.height = len(rowClues)
         board.width = len(colClues)
         board.answerKey = np.zeros((board.height, board.width),
-                                   dtype=bool)  # TODO: make this answer key by solving the puzzle
+                                   dtype=bool)  # Solving is slow, so this is only filled in by initializeAnswerKeyFromClues
         board.board = np.zeros((board.height, board.width), dtype=int)
         board.rowClues = rowClues
         board.colClues = colClues
         return board
 
     @classmethod
-    def initFromGrid(cls, inputGrid: NonogramTileGrid):
+    def initFromGrid(cls, inputGrid: "NonogramTileGrid"):
         """
         Create a board from a filled-in NonogramTileGrid
         :param inputGrid: a NonogramTileGrid that indicates the answerKey for the board
@@ -47,72 +102,144 @@ class NonogramBoard:
         board.answerKey = np.zeros((board.height, board.width), dtype=bool)
         board.board = np.zeros((board.height, board.width), dtype=int)
         board.initializeAnswerKeyFromTileGrid(inputGrid)
-        # TODO: Add verify here ( check for multiple solutions )
         return board
 
-    def initializeAnswerKeyFromClues(self, rowClues, colClues):
-        # TODO: solve the board, then create the answer key
-        pass
+    def trackAnswerKey(self):
+        """
+        Counts the mismatches and errors of the whole board against the answer key, and keeps the counts up to date
+        from then on, so that checking the board never needs a full scan. This is called whenever the answer key is
+        replaced. Boards without an answer key, like the ones solvers work on, are not tracked and pay nothing.
+        """
+        filled = self.board == 2
+        mismatches = filled != self.answerKey
+        errors = mismatches & (self.board != 0)
+        self.tracking = True
+        self.numMismatches = int(mismatches.sum())
+        self.numErrors = int(errors.sum())
+        self.rowMismatches = mismatches.sum(axis=1).tolist()
+        self.colMismatches = mismatches.sum(axis=0).tolist()
+        self.rowErrors = errors.sum(axis=1).tolist()
+        self.colErrors = errors.sum(axis=0).tolist()
+        self.wrongRows = {row for row, numErrors in enumerate(self.rowErrors) if numErrors > 0}
+        self.wrongCols = {col for col, numErrors in enumerate(self.colErrors) if numErrors > 0}
+
+    def trackCell(self, row, col, sign):
+        """
+        Adds (sign=1) or removes (sign=-1) one cell's share of the tracked counts. A cell is changed by removing its
+        share, changing it, and adding its share back.
+        """
+        number = self.board[row, col]
+        if (number == 2) == self.answerKey[row, col]:
+            return
+        self.numMismatches += sign
+        self.rowMismatches[row] += sign
+        self.colMismatches[col] += sign
+        if number == 0:
+            return
+        self.numErrors += sign
+        self.rowErrors[row] += sign
+        self.colErrors[col] += sign
+        if self.rowErrors[row] == 0:
+            self.wrongRows.discard(row)
+        else:
+            self.wrongRows.add(row)
+        if self.colErrors[col] == 0:
+            self.wrongCols.discard(col)
+        else:
+            self.wrongCols.add(col)
+
+    def isSolved(self):
+        """
+        :return: True if the cells marked "yes" are exactly the answer key. Cells left unknown count as "no".
+        """
+        return self.numMismatches == 0
 
-    def initializeAnswerKeyFromTileGrid(self, gameGrid: NonogramTileGrid):
+    def isRowSolved(self, row):
+        return self.rowMismatches[row] == 0
+
+    def isColSolved(self, col):
+        return self.colMismatches[col] == 0
+
+    def getWrongLines(self):
+        """
+        :return: (rows, cols), sorted lists of the rows and columns with at least one wrongly marked cell
+        """
+        return sorted(self.wrongRows), sorted(self.wrongCols)
+
+    def findSolutions(self, maxSteps=None, maxTime=None):
+        """
+        Searches the clues of the board for up to two solutions, which is enough to tell whether the puzzle is unique.
+        This ignores the current state of the board. The result of a search that finishes is kept until the clues change,
+        so checking the same puzzle again costs nothing. A search that gives up is not kept, so it can be retried with a
+        bigger budget.
+        :param maxSteps: give up once the search has assigned this many cells (None for no limit)
+        :param maxTime: give up once the search has run for this many seconds (None for no limit)
+        :return: (numSolutions, solutions), where numSolutions is at most 2, or None if the search gave up before it
+        could tell, and solutions is a list of the boolean arrays found (True for filled)
+        """
+        if self.solutionSearch is not None:
+            return self.solutionSearch
+        clueVersion = self.clueVersion
+        solver = NonogramPropagationSolver(NonogramBoard.initFromClues([list(clue) for clue in self.rowClues],
+                                                                       [list(clue) for clue in self.colClues]))
+        solver.verbose = False
+        solver.start(limit=2)
+        finished = solver.resume(maxSteps=maxSteps, maxTime=maxTime)
+        solver.undoTo(0)
+        result = (len(solver.solutions) if finished else None, solver.solutions)
+        if finished and clueVersion == self.clueVersion:  # The clues were not edited while they were searched
+            self.solutionSearch = result
+        return result
+
+    def initializeAnswerKeyFromClues(self, maxSteps=None, maxTime=None):
+        """
+        Creates the answer key by solving the clues (see findSolutions). It is only set if the clues have a unique
+        solution, since otherwise tracking would count a different valid solution as wrong.
+        :param maxSteps: give up once the search has assigned this many cells (None for no limit)
+        :param maxTime: give up once the search has run for this many seconds (None for no limit)
+        :return: the number of solutions found, up to 2, or None if the search gave up first. The answer key is left as
+        it was unless this is 1.
+        """
+        numSolutions, solutions = self.findSolutions(maxSteps, maxTime)
+        if numSolutions == 1:
+            self.answerKey = solutions[0]
+            self.trackAnswerKey()
+        return numSolutions
+
+    def initializeAnswerKeyFromTileGrid(self, gameGrid: "NonogramTileGrid"):
         """ This creates a puzzle from an arbitrary layout of a game grid. It does not do any checking for puzzle validity """
-        self.rowClues = []
-        for row in range(self.height):
-            prevStatus = "no"
-            yesCount = 0
-            rowClue = []
-            for col in range(self.width):
-                status = gameGrid.getTile(row, col).status
-                if status == "yes":
-                    self.answerKey[row, col] = True
-                else:
-                    self.answerKey[row, col] = False
-
-                if prevStatus == "yes":
-                    if status is "yes":
-                        yesCount += 1
-                    else:  # yes -> no, need to add our clue and reset the counter
-                        rowClue.append(yesCount)
-                        yesCount = 0
-                else:
-                    if status is "yes":
-                        yesCount += 1
-
-                # Handle case when we have yes at the end and so we never got the yes -> no transition
-                if col == (self.width - 1):
-                    if yesCount > 0:
-                        rowClue.append(yesCount)
-                prevStatus = status
-            if rowClue == []:
-                rowClue = [0]
-            self.rowClues.append(rowClue)
-
-        self.colClues = []
-        for col in range(self.width):
-            prevStatus = "no"
-            yesCount = 0
-            colClue = []
-            for row in range(self.height):
-                status = gameGrid.getTile(row, col).status
-
-                if prevStatus == "yes":
-                    if status is "yes":
-                        yesCount += 1
-                    else:  # yes -> no, need to add our clue and reset the counter
-                        colClue.append(yesCount)
-                        yesCount = 0
-                else:
-                    if status is "yes":
-                        yesCount += 1
-
-                # Handle case when we have yes at the end and so we never got the yes -> no transition
-                if row == (self.height - 1):
-                    if yesCount > 0:
-                        colClue.append(yesCount)
-                prevStatus = status
-            if colClue == []:
-                colClue = [0]
-            self.colClues.append(colClue)
+        self.answerKey = np.array([[gameGrid.getTile(row, col).status == "yes" for col in range(self.width)]
+                                   for row in range(self.height)], dtype=bool).reshape(self.height, self.width)
+        self.rowClues, self.colClues = cluesFromAnswerKey(self.answerKey)
+        self.clueVersion += 1
+        self.solutionSearch = None
+        self.trackAnswerKey()
+
+    @staticmethod
+    def lineClue(line):
+        """
+        Creates the clue for a single line of an answer key
+        :param line: booleans indicating which tiles of the line are selected
+        :return: list of the lengths of each run of selected tiles, or [0] if there are none
+        """
+        return runLengthClues(np.asarray(line, dtype=bool).reshape(1, -1))[0]
+
+    def setAnswerCell(self, row, col, selected):
+        """
+        Changes one cell of the answer key, and recomputes only the row and column clues that go through it
+        :param row: row of the cell
+        :param col: column of the cell
+        :param selected: True if the cell is part of the answer
+        """
+        if self.tracking:
+            self.trackCell(row, col, -1)
+        self.answerKey[row, col] = selected
+        if self.tracking:
+            self.trackCell(row, col, 1)
+        self.rowClues[row] = self.lineClue(self.answerKey[row, :])
+        self.colClues[col] = self.lineClue(self.answerKey[:, col])
+        self.clueVersion += 1
+        self.solutionSearch = None
 
     def status2boardNumber(self, status):
         if status is "unknown":
@@ -129,9 +256,54 @@ class NonogramBoard:
         :param col: column to update
         :param status: status to update
         """
-        self.board[row, col] = self.status2boardNumber(status)
+        if self.tracking:
+            self.trackCell(row, col, -1)
+            self.board[row, col] = self.status2boardNumber(status)
+            self.trackCell(row, col, 1)
+        else:
+            self.board[row, col] = self.status2boardNumber(status)
 
-    def copyTileGrid(self, gameGrid: NonogramTileGrid):
+    def resetBoard(self):
+        """ Sets every cell of the board back to unknown, keeping the clues and answer key """
+        self.board[:] = 0
+        if self.tracking:
+            self.trackAnswerKey()
+
+    def getCell(self, row, col):
+        """
+        :return: board number (0 unknown, 1 no, 2 yes) of the given cell
+        """
+        return int(self.board[row, col])
+
+    def getRow(self, row):
+        """
+        :return: list of board numbers for every cell in the given row
+        """
+        return self.board[row, :].tolist()
+
+    def getCol(self, col):
+        """
+        :return: list of board numbers for every cell in the given column
+        """
+        return self.board[:, col].tolist()
+
+    def copy(self):
+        """
+        Creates a copy of the board. The clues are shared, but the cells and answer key are not.
+        :return: a new NonogramBoard in the same state
+        """
+        board = NonogramBoard()
+        board.height = self.height
+        board.width = self.width
+        board.board = self.board.copy()
+        board.answerKey = self.answerKey.copy()
+        board.rowClues = self.rowClues
+        board.colClues = self.colClues
+        if self.tracking:
+            board.trackAnswerKey()
+        return board
+
+    def copyTileGrid(self, gameGrid: "NonogramTileGrid"):
         """
         Sets the state of the board to copy a given NonogramTileGrid
         :param gameGrid: the NonogramTileGrid to copy
@@ -140,8 +312,6 @@ class NonogramBoard:
             for col in range(self.width):
                 self.updateBoard(row, col, gameGrid.getTile(row, col).status)
 
-    # TODO: Add an initialize from clues function. This will require the solver to work.
-
     def __str__(self):
         toReturn = "Nonogram Board:"
         for row in range(self.height):
@@ -0,0 +1,112 @@
+"""
+Filename: nonogram_branching.py
+Date Created: 10/18/2026
+
+Branching strategies for NonogramPropagationSolver, which decide what cell to guess when propagation stalls. The solver
+keeps a running count of the unknown cells of every row and column, and a counter of changes to every line, so a
+strategy can pick a line by scanning the lines rather than the cells of the board.
+"""
+
+from nonogram_line_solver import countPlacements, UNKNOWN
+
+
+class RowMajorBranching:
+    """ Guesses the first unknown cell, going top to bottom, left to right """
+    def __init__(self, solver):
+        self.solver = solver
+
+    def getBranchCell(self):
+        """
+        :return: (row, col) of the cell to guess, or (None, None) if the board is full
+        """
+        board = self.solver.board
+        for row in range(board.height):
+            if self.solver.rowUnknown[row] > 0:
+                for col, number in enumerate(board.getRow(row)):
+                    if number == UNKNOWN:
+                        return row, col
+        return None, None
+
+
+class MostConstrainedLineBranching(RowMajorBranching):
+    """
+    Guesses a cell in the line with the fewest unknown cells, since that line is closest to being solved. Within the
+    line, the cell whose crossing line has the fewest unknown cells is guessed, since the guess is then most likely to
+    let propagation finish the crossing line too.
+    """
+    def getBranchCell(self):
+        isRow, index = self.getBranchLine()
+        if index is None:
+            return None, None
+        return self.getCellInLine(isRow, index)
+
+    def getLineScore(self, isRow, index):
+        """
+        :return: how constrained a line with unknown cells is. Lower scores are branched on first.
+        """
+        return self.solver.rowUnknown[index] if isRow else self.solver.colUnknown[index]
+
+    def getBranchLine(self):
+        """
+        :return: (isRow, index) of the line with the lowest score that still has unknown cells, or (None, None)
+        """
+        best = None
+        bestLine = (None, None)
+        for isRow, unknowns in ((True, self.solver.rowUnknown), (False, self.solver.colUnknown)):
+            for index, numUnknown in enumerate(unknowns):
+                if numUnknown == 0:
+                    continue
+                score = self.getLineScore(isRow, index)
+                if best is None or score < best:
+                    best = score
+                    bestLine = (isRow, index)
+        return bestLine
+
+    def getCellInLine(self, isRow, index):
+        """
+        :return: (row, col) of the unknown cell of a line whose crossing line has the fewest unknown cells
+        """
+        if isRow:
+            line = self.solver.board.getRow(index)
+            crossing = self.solver.colUnknown
+        else:
+            line = self.solver.board.getCol(index)
+            crossing = self.solver.rowUnknown
+        cells = [i for i, number in enumerate(line) if number == UNKNOWN]
+        i = min(cells, key=lambda cell: crossing[cell])
+        return (index, i) if isRow else (i, index)
+
+
+class FewestPlacementsBranching(MostConstrainedLineBranching):
+    """
+    Guesses a cell in the line with the fewest legal placements left. Every unknown cell of that line differs between
+    its placements, so each guess rules out as many placements as possible. Placement counts are cached per line, and
+    only recounted for lines that have changed since they were last counted.
+    """
+    def __init__(self, solver):
+        MostConstrainedLineBranching.__init__(self, solver)
+        board = solver.board
+        self.rowCounts = [(None, 0)] * board.height  # (line change counter when counted, number of placements)
+        self.colCounts = [(None, 0)] * board.width
+
+    def getLineScore(self, isRow, index):
+        if isRow:
+            counts, changes = self.rowCounts, self.solver.rowChanges
+        else:
+            counts, changes = self.colCounts, self.solver.colChanges
+        counted, numPlacements = counts[index]
+        if counted != changes[index]:
+            if isRow:
+                numPlacements = countPlacements(self.solver.board.rowClues[index], self.solver.board.getRow(index))
+            else:
+                numPlacements = countPlacements(self.solver.board.colClues[index], self.solver.board.getCol(index))
+            counts[index] = (changes[index], numPlacements)
+        return numPlacements
+
+
+# Every branching strategy that can be selected by name, with NonogramPropagationSolver(board, branching=name)
+BRANCHING_STRATEGIES = {
+    "rowMajor": RowMajorBranching,
+    "mostConstrainedLine": MostConstrainedLineBranching,
+    "fewestPlacements": FewestPlacementsBranching,
+}
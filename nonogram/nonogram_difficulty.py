@@ -0,0 +1,193 @@
+"""
+Filename: nonogram_difficulty.py
+Date Created: 10/18/2026
+
+Rates how hard puzzles are, from the effort it takes to solve them. A puzzle is first line solved in sweeps, where
+each sweep re-solves every line that changed in the sweep before, as a player working through the board would. If line
+solving stalls, the search carries on from the cells it deduced, probing cells before it guesses, and the number of
+probes, guesses and how deeply the guesses nest are recorded too. One JSON object is written per puzzle, one per line:
+    python nonogram_difficulty.py puzzles
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_line_cache import sharedLineCache
+from nonogram_line_solver import UNKNOWN
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_puzzle_file import PuzzleFileError, iterPuzzleFiles, readPuzzleFile
+
+# Lowest score of each tier, from easiest to hardest
+TIERS = [(0, "easy"), (8, "medium"), (16, "hard"), (30, "expert")]
+
+# Weights of each part of the score
+SWEEP_WEIGHT = 1.0
+PROBE_WEIGHT = 5.0
+SEARCH_WEIGHT = 10.0
+DEPTH_WEIGHT = 3.0
+BACKTRACK_WEIGHT = 2.0
+
+
+def sweepLineSolve(rowClues, colClues):
+    """
+    Line solves a puzzle in sweeps until line solving deduces nothing more. The first sweep solves every row, then
+    every column. Each later sweep solves the lines crossing a cell that the sweep before it filled in.
+    :return: (sweeps, lineSolves, grid, consistent), where grid is the array of board numbers line solving ended on,
+    and consistent is False if some line turned out to have no legal placement
+    """
+    height, width = len(rowClues), len(colClues)
+    grid = np.zeros((height, width), dtype=np.int8)
+    dirtyRows = set(range(height))
+    dirtyCols = set(range(width))
+    sweeps = 0
+    lineSolves = 0
+    while dirtyRows or dirtyCols:
+        sweeps += 1
+        nextRows = set()
+        nextCols = set()
+        for row in sorted(dirtyRows):
+            line = grid[row, :].tolist()
+            solved = sharedLineCache.solve(rowClues[row], line)
+            lineSolves += 1
+            if solved is None:
+                return sweeps, lineSolves, grid, False
+            for col, (old, new) in enumerate(zip(line, solved)):
+                if old != new:
+                    grid[row, col] = new
+                    nextCols.add(col)
+        for col in sorted(dirtyCols | nextCols):
+            line = grid[:, col].tolist()
+            solved = sharedLineCache.solve(colClues[col], line)
+            lineSolves += 1
+            if solved is None:
+                return sweeps, lineSolves, grid, False
+            for row, (old, new) in enumerate(zip(line, solved)):
+                if old != new:
+                    grid[row, col] = new
+                    nextRows.add(row)
+        dirtyRows = nextRows
+        dirtyCols = set()  # Columns changed by this sweep's rows were already solved in it
+    return sweeps, lineSolves, grid, True
+
+
+def getTier(score):
+    """
+    :return: name of the tier a difficulty score falls in
+    """
+    tier = TIERS[0][1]
+    for minScore, name in TIERS:
+        if score >= minScore:
+            tier = name
+    return tier
+
+
+def ratePuzzle(rowClues, colClues, maxSteps=None):
+    """
+    Rates the difficulty of a puzzle. Puzzles that line solving finishes score one point per sweep. Puzzles that need
+    probing score extra for it. Puzzles that need guesses on top of that score extra for needing them at all, for the
+    deepest nesting of guesses, and for the number of backtracks.
+    :param rowClues: row clues of the puzzle
+    :param colClues: col clues of the puzzle
+    :param maxSteps: give up searching after this many steps (None for no limit). The status is then "unknown", the
+    score is a lower bound, and the tier is None.
+    :return: dict of the effort measurements, the solution status, the score and the tier
+    """
+    startTime = time.perf_counter()
+    sweeps, lineSolves, grid, consistent = sweepLineSolve(rowClues, colClues)
+    numUnknown = int(np.count_nonzero(grid == UNKNOWN))
+    rating = {"sweeps": sweeps,
+              "lineSolves": lineSolves,
+              "lineSolvedFraction": 1.0 - numUnknown / grid.size,
+              "requiresProbing": False,
+              "requiresSearch": False,
+              "probes": 0,
+              "probeDeductions": 0,
+              "guesses": 0,
+              "backtracks": 0,
+              "maxDepth": 0,
+              "searchSteps": 0,
+              "complete": True}
+
+    if not consistent:
+        rating["status"] = "unsolvable"
+    elif numUnknown == 0:
+        rating["status"] = "unique"
+    else:
+        board = NonogramBitBoard.initFromClues(rowClues, colClues)
+        for row, col in np.argwhere(grid != UNKNOWN).tolist():  # Start from where line solving stalled
+            board.setCell(row, col, int(grid[row, col]))
+        solver = NonogramPropagationSolver(board, lineCache=sharedLineCache, probing=True)
+        solver.verbose = False
+        solver.start(limit=2)
+        finished = solver.resume(maxSteps=maxSteps)
+        solver.undoTo(0)
+        if finished:
+            rating["status"] = ["unsolvable", "unique", "multiple"][len(solver.solutions)]
+        else:
+            rating["status"] = "unknown"  # The search gave up before it could tell
+        rating["requiresProbing"] = solver.numProbeDeductions > 0
+        rating["requiresSearch"] = solver.numGuesses > 0
+        rating["probes"] = solver.numProbes
+        rating["probeDeductions"] = solver.numProbeDeductions
+        rating["guesses"] = solver.numGuesses
+        rating["backtracks"] = solver.numBacktracks
+        rating["maxDepth"] = solver.maxDepth
+        rating["searchSteps"] = solver.numSteps
+        rating["complete"] = finished
+
+    score = SWEEP_WEIGHT * sweeps
+    if rating["requiresProbing"]:
+        score += PROBE_WEIGHT
+    if rating["requiresSearch"]:
+        score += SEARCH_WEIGHT + DEPTH_WEIGHT * rating["maxDepth"] + \
+            BACKTRACK_WEIGHT * math.log2(1 + rating["backtracks"])
+    rating["score"] = round(score, 2)
+    rating["tier"] = getTier(score) if rating["complete"] else None  # An unfinished search only gives a lower bound
+    rating["time"] = time.perf_counter() - startTime
+    return rating
+
+
+def rateFile(path, maxSteps=None):
+    """
+    Rates a single .puz file
+    :return: dict of the rating, ready to be written as JSON
+    """
+    try:
+        rowClues, colClues = readPuzzleFile(path)
+    except (OSError, PuzzleFileError) as e:
+        return {"puzzle": path, "status": "error", "error": str(e)}
+    rating = {"puzzle": path}
+    rating.update(ratePuzzle(rowClues, colClues, maxSteps))
+    return rating
+
+
+def rateFileTask(task):
+    return rateFile(*task)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rate the difficulty of .puz files, writing one JSON result per line.")
+    parser.add_argument("paths", nargs="+", help=".puz files, directories of .puz files, or glob patterns")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of cores)")
+    parser.add_argument("--max-steps", type=int, default=None,
+                        help="stop searching a puzzle after this many steps (default: no limit)")
+    args = parser.parse_args(argv)
+
+    tasks = ((path, args.max_steps) for path in iterPuzzleFiles(args.paths))
+    with Pool(processes=args.processes) as pool:
+        for rating in pool.imap_unordered(rateFileTask, tasks, chunksize=16):
+            sys.stdout.write(json.dumps(rating) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
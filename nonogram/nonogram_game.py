@@ -4,12 +4,14 @@ Date Created: 4/24/2021
 """
 import tkinter as tk
 from tkinter import simpledialog, filedialog
-import time
 import os
+import queue
+import threading
 
-from nonogram_tile_grid import NonogramTileGrid
+from nonogram_tile_grid import NonogramTileGrid, NonogramCanvasTileGrid
 from nonogram_board import NonogramBoard
-from nonogram_solver import NonogramSolver
+from nonogram_solver_registry import SOLVER_TYPES
+from nonogram_puzzle_file import PUZZLE_DIR, PuzzleFileError, readPuzzleFile, writePuzzleFile
 
 
 class Settings:
@@ -23,22 +25,19 @@ class Settings:
     yesColor = "black"
     width = 15
     height = 15
-    solverSleepTime = 0
+    solverFrameRate = 30  # Most times per second the board is repainted while the solver runs
+    solverChunkSteps = 500  # Steps the solver takes between checks for pause/cancel
+    solverType = "propagation"  # Solver the Solve button uses, one of SEARCH_SOLVERS in nonogram_solver_registry
+    puzzleCheckTime = 30.0  # Seconds a puzzle check may search for before giving up. Checks run on a worker thread.
     tileMinHeight = 25
     tileMinWidth = 25
+    canvasGridMinTiles = 1600  # Boards with at least this many tiles are drawn on a canvas rather than with widgets
 
 class NonogramGame(tk.Frame):
     def __init__(self, parent):
         tk.Frame.__init__(self, parent)
 
-        self.nonogramGrid = NonogramTileGrid(self,
-                                             cols=Settings.width, rows=Settings.height,
-                                             tileChangeCallback=self.onGameBoardChange,
-                                             colorUnknown=Settings.unknownColor,
-                                             colorNo=Settings.noColor,
-                                             colorYes=Settings.yesColor,
-                                             tileMinWidth=Settings.tileMinWidth,
-                                             tileMinHeight=Settings.tileMinHeight)
+        self.nonogramGrid = self.createNonogramGrid(Settings.height, Settings.width)
         self.nonogramGrid.grid(row=1, column=1, sticky="nsew")
 
         # Restrict the rows/columns of the game board from becoming too small, and make them expand to fill on resize
@@ -63,6 +62,8 @@ class NonogramGame(tk.Frame):
         self.saveButton = tk.Button(master=self.controlFrame, text="Save", bg=Settings.controlButtonColor, relief="raised", command=self.onSaveButtonClicked)
         self.solveButton = tk.Button(master=self.controlFrame, text="Solve", bg=Settings.controlButtonColor, relief="raised", command=self.onSolveButtonClicked)
         self.checkButton = tk.Button(master=self.controlFrame, text="Check", bg=Settings.controlButtonColor, relief="raised", command=self.onCheckButtonClicked)
+        self.pauseButton = tk.Button(master=self.controlFrame, text="Pause", bg=Settings.controlButtonColor, relief="raised", command=self.onPauseButtonClicked)
+        self.cancelButton = tk.Button(master=self.controlFrame, text="Cancel", bg=Settings.controlButtonColor, relief="raised", command=self.onCancelButtonClicked)
         self.switchModeButton = tk.Button(master=self.controlFrame, text="Switch mode", bg=Settings.controlButtonColor, relief='raised', command=self.onSwitchModeButtonClicked)
 
         """ Set up for creation mode """
@@ -76,12 +77,38 @@ class NonogramGame(tk.Frame):
 
         """ Initialize our internal nonogram board """
         self.nonogramBoard = None
+        self.puzzleLoaded = False  # True while the board holds a puzzle loaded from a file, rather than drawn on the grid
         self.setPuzzle()  # Initialize the empty puzzle
 
         """ Configure the Solver"""
-        self.solver = NonogramSolver(self.nonogramBoard)
+        self.solver = SOLVER_TYPES[Settings.solverType](self.nonogramBoard)
         self.solver.configureCallbackFunction(self.onSolverStep)
 
+        # The solver runs on a worker thread and queues its steps, which the Tk thread paints once per frame
+        self.solverThread = None
+        self.solverSteps = queue.Queue()
+        self.solverRunning = threading.Event()  # Cleared while the solver is paused
+        self.solverCancelled = threading.Event()
+        self.solverFinished = threading.Event()
+
+    def createNonogramGrid(self, rows, cols):
+        """
+        Creates the game grid. Large boards are drawn on a single canvas, since a widget per tile gets slow to create
+        and resize.
+        :param rows: number of rows of the board
+        :param cols: number of columns of the board
+        :return: a NonogramTileGrid or NonogramCanvasTileGrid
+        """
+        gridClass = NonogramCanvasTileGrid if rows * cols >= Settings.canvasGridMinTiles else NonogramTileGrid
+        return gridClass(self,
+                         cols=cols, rows=rows,
+                         tileChangeCallback=self.onGameBoardChange,
+                         colorUnknown=Settings.unknownColor,
+                         colorNo=Settings.noColor,
+                         colorYes=Settings.yesColor,
+                         tileMinWidth=Settings.tileMinWidth,
+                         tileMinHeight=Settings.tileMinHeight)
+
     def initClueLabels(self):
         """ Set up the row clue labels"""
         self.rowClueFrame = tk.Frame(master=self)
@@ -115,6 +142,10 @@ class NonogramGame(tk.Frame):
         self.solveButton.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
     def showCheckButton(self):
         self.checkButton.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+    def showPauseButton(self):
+        self.pauseButton.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+    def showCancelButton(self):
+        self.cancelButton.grid(row=0, column=1, sticky="nsew", padx=5, pady=5)
 
     def onSaveButtonClicked(self):
         """
@@ -123,57 +154,25 @@ class NonogramGame(tk.Frame):
         """
         saveName = tk.simpledialog.askstring("Save Puzzle", "What would you like to call your puzzle?")
         if saveName is not None:
-            file = open("puzzles/" + saveName + ".puz", "w")
-            file.write("Rows:\n")
-            file.write(str(self.nonogramGrid.height) + "\n")
-            file.write("Cols:\n")
-            file.write(str(self.nonogramGrid.width) + "\n")
-            file.write("Row clues:\n")
-            for rowClue in self.nonogramBoard.rowClues:
-                for clue in rowClue:
-                    file.write(str(clue) + " ")
-                file.write("\n")
-            file.write("Col clues:\n")
-            for colClue in self.nonogramBoard.colClues:
-                for clue in colClue:
-                    file.write(str(clue) + " ")
-                file.write("\n")
-            file.close()
+            writePuzzleFile(os.path.join(PUZZLE_DIR, saveName + ".puz"), self.nonogramBoard.rowClues, self.nonogramBoard.colClues)
 
     def onLoadButtonClicked(self):
-        loadFile = filedialog.askopenfilename(initialdir=os.getcwd()+"\\nonogram\\puzzles", title="Load Puzzle", filetypes=[("Nonogram Puzzles", "*.puz")])
-        f = open(loadFile, "r")
-        f.readline()         # rows
-        line = f.readline()  # numRows
-        numRows = int(line)
-        f.readline()         # cols
-        line = f.readline()  # numCols
-        numCols = int(line)
-        f.readline()         # rowClues
-
-        rowClues = []
-        for i in range(numRows):
-            line = f.readline()
-            rowClues.append([int(a) for a in line.split()])
-
-        f.readline()         # colClues
-        colClues = []
-        for i in range(numCols):
-            line = f.readline()
-            colClues.append([int(a) for a in line.split()])
-        f.close()
+        loadFile = filedialog.askopenfilename(initialdir=PUZZLE_DIR, title="Load Puzzle", filetypes=[("Nonogram Puzzles", "*.puz")])
+        if not loadFile:
+            return
+        try:
+            rowClues, colClues = readPuzzleFile(loadFile)
+        except (OSError, PuzzleFileError) as e:
+            print("Could not load puzzle: " + str(e))
+            return
+        numRows = len(rowClues)
+        numCols = len(colClues)
 
         self.nonogramBoard = NonogramBoard.initFromClues(rowClues, colClues)
+        self.puzzleLoaded = True
         if numRows != self.nonogramGrid.height or numCols != self.nonogramGrid.width:
             self.nonogramGrid.forget()
-            self.nonogramGrid = NonogramTileGrid(self,
-                                                 cols=numCols, rows=numRows,
-                                                 tileChangeCallback=self.onGameBoardChange,
-                                                 colorUnknown=Settings.unknownColor,
-                                                 colorNo=Settings.noColor,
-                                                 colorYes=Settings.yesColor,
-                                                 tileMinWidth=Settings.tileMinWidth,
-                                                 tileMinHeight=Settings.tileMinHeight)
+            self.nonogramGrid = self.createNonogramGrid(numRows, numCols)
             self.nonogramGrid.grid(row=1, column=1, sticky="nsew")
             self.rowClueFrame.forget()
             self.columnClueFrame.forget()
@@ -183,75 +182,230 @@ class NonogramGame(tk.Frame):
 
         self.setClueLabels()
 
+        # The solution is drawn on the grid once it is found, so the grid cannot be edited until then
+        self.nonogramGrid.setClickable(False)
+        self.switchModeButton.configure(state="disabled")
+        self.checkPuzzle(self.onLoadedPuzzleChecked)
+
+    def onLoadedPuzzleChecked(self, numSolutions, solutions):
+        if numSolutions is None:
+            print("Warning: gave up solving this puzzle after " + str(Settings.puzzleCheckTime) +
+                  " seconds, so it cannot be checked")
+        elif numSolutions == 0:
+            print("Warning: this puzzle has no solution, so it cannot be checked")
+        elif numSolutions > 1:
+            print("Warning: this puzzle does not have a unique solution, so it cannot be checked")
+        else:
+            self.nonogramBoard.initializeAnswerKeyFromClues()  # The search is already done, so this only sets the key
+            self.showAnswerKey()  # Draw the solution, so that editing it keeps the clues describing one puzzle
+        self.nonogramGrid.setClickable(True)
+        self.switchModeButton.configure(state="normal")
+
+    def checkPuzzle(self, onChecked):
+        """
+        Searches the clues of the board for solutions (see NonogramBoard.findSolutions) on a worker thread, so the
+        window keeps responding, and calls onChecked(numSolutions, solutions) on the Tk thread once the search is done.
+        The result is dropped if the board has been replaced or its clues edited by then.
+        :param onChecked: function to call with the result
+        """
+        board = self.nonogramBoard
+        if board.solutionSearch is not None:
+            onChecked(*board.solutionSearch)
+            return
+        results = []  # Filled in by the worker thread
+        thread = threading.Thread(target=lambda: results.append(board.findSolutions(maxTime=Settings.puzzleCheckTime)),
+                                  daemon=True)
+        thread.start()
+        self.after(1000 // Settings.solverFrameRate, self.pollPuzzleCheck, board, board.clueVersion, thread, results,
+                   onChecked)
+
+    def pollPuzzleCheck(self, board, clueVersion, thread, results, onChecked):
+        """ Waits on the Tk thread for a check started by checkPuzzle to finish """
+        if thread.is_alive():
+            self.after(1000 // Settings.solverFrameRate, self.pollPuzzleCheck, board, clueVersion, thread, results,
+                       onChecked)
+        elif board is self.nonogramBoard and board.clueVersion == clueVersion and results:
+            onChecked(*results[0])
+
 
     def onSolveButtonClicked(self):
         self.nonogramGrid.setClickable(False)
+        self.switchModeButton.configure(state="disabled")
+        self.solveButton.grid_forget()
+        self.checkButton.grid_forget()
+        self.pauseButton.configure(text="Pause")
+        self.showPauseButton()
+        self.showCancelButton()
+
+        # Solve from the clues alone, so that a wrong mark by the player cannot make the puzzle look unsolvable
+        self.solver.board = NonogramBoard.initFromClues(self.nonogramBoard.rowClues, self.nonogramBoard.colClues)
+        self.nonogramGrid.resetGrid()
+        self.solverSteps = queue.Queue()
+        self.solverRunning.set()
+        self.solverCancelled.clear()
+        self.solverFinished.clear()
+        self.solverThread = threading.Thread(target=self.runSolver, daemon=True)
+        self.solverThread.start()
+        self.after(1000 // Settings.solverFrameRate, self.drainSolverSteps)
+
+    def runSolver(self):
+        """
+        Runs on the solver thread. The solver works in chunks of steps so that it can be paused and cancelled between
+        them. This must not touch any Tk widgets.
+        """
+        self.solver.start()
+        while not self.solverCancelled.is_set():
+            self.solverRunning.wait()
+            if self.solverCancelled.is_set():
+                break
+            if self.solver.resume(maxSteps=Settings.solverChunkSteps):
+                break
+        self.solverFinished.set()
 
-        self.solver.board = self.nonogramBoard
-        self.solver.solvePuzzle()
+    def onSolverStep(self, row, col, status):
+        """ Called on the solver thread for every cell the solver changes """
+        self.solverSteps.put((row, col, status))
 
+    def drainSolverSteps(self):
+        """
+        Paints every step the solver has queued since the last frame. Only the latest status of each cell is painted,
+        so the board is repainted at most Settings.solverFrameRate times a second, however fast the solver runs.
+        """
+        finished = self.solverFinished.is_set()  # Checked first, so the steps drained below include the last ones
+        changes = {}
+        while True:
+            try:
+                row, col, status = self.solverSteps.get_nowait()
+            except queue.Empty:
+                break
+            changes[row, col] = status
+        with self.nonogramGrid.batchUpdates():
+            for (row, col), status in changes.items():
+                self.nonogramGrid.getTile(row, col).setStatus(status)
+
+        if finished:
+            self.onSolverFinished()
+        else:
+            self.after(1000 // Settings.solverFrameRate, self.drainSolverSteps)
+
+    def onSolverFinished(self):
+        self.nonogramBoard.copyTileGrid(self.nonogramGrid)  # Keep the player's board in step with what the solver drew
+        if self.solverCancelled.is_set():
+            print("Solver cancelled after " + str(self.solver.numSteps) + " steps.")
+        elif self.solver.solutions:
+            print("Puzzle Solved! It took " + str(self.solver.numSteps) + " steps.")
+        else:
+            print("Puzzle has no solution. Gave up after " + str(self.solver.numSteps) + " steps.")
+
+        self.solverThread = None
+        self.pauseButton.grid_forget()
+        self.cancelButton.grid_forget()
+        self.showSolveButton()
+        self.showCheckButton()
+        self.switchModeButton.configure(state="normal")
         self.nonogramGrid.setClickable(True)
 
-    def onSolverStep(self, row, col, status):
-        self.nonogramGrid.getTile(row,col).setStatus(status)
-        time.sleep(Settings.solverSleepTime)
-        self.update()  # Force the grid to show the progress
-        self.onGameBoardChange(row, col, status)
+    def onPauseButtonClicked(self):
+        if self.solverRunning.is_set():
+            self.solverRunning.clear()
+            self.pauseButton.configure(text="Resume")
+        else:
+            self.solverRunning.set()
+            self.pauseButton.configure(text="Pause")
+
+    def onCancelButtonClicked(self):
+        self.solverCancelled.set()
+        self.solverRunning.set()  # Wake the solver thread if it is paused, so that it can stop
 
     def onCheckButtonClicked(self):
-        # TODO: create function in NonogramBoard that checks the current state of the game board against its answerKey
-        print("Check not yet implemented")
-        # valid = True
-        # for row in range(self.nonogramBoard.height):
-        #     if not self.nonogramBoard.verifyRow(row):
-        #         valid = False
-        # for col in range(self.nonogramBoard.width):
-        #     if not self.nonogramBoard.verifyCol(col):
-        #         valid = False
-        # print("Check: ", valid)
+        """ Reports the wrongly marked cells, from the counts the board keeps against its answer key """
+        if not self.nonogramBoard.tracking:
+            print("Check: this puzzle has no answer key to check against")
+        elif self.nonogramBoard.isSolved():
+            print("Check: the puzzle is solved!")
+        elif self.nonogramBoard.numErrors == 0:
+            print("Check: no mistakes so far")
+        else:
+            wrongRows, wrongCols = self.nonogramBoard.getWrongLines()
+            print("Check: " + str(self.nonogramBoard.numErrors) + " wrong cell(s), in rows " +
+                  ", ".join(str(row + 1) for row in wrongRows) + " and columns " +
+                  ", ".join(str(col + 1) for col in wrongCols))
 
     def onSwitchModeButtonClicked(self):
         self.switchMode()
 
     def onGameBoardChange(self, row, col, status):
-        if self.gameMode is "creation":  # Set the clues to update as we edit the board
-            self.setPuzzle(validate=False)
+        if self.gameMode is "creation":
+            if self.puzzleLoaded and not self.nonogramBoard.tracking:
+                # The loaded puzzle has no solution to draw, so the grid was blank and the edit starts a new puzzle
+                self.setPuzzle()
+            else:  # Update the clues of the row and column we just edited
+                self.nonogramBoard.setAnswerCell(row, col, status == "yes")
+                self.setRowClueLabel(row)
+                self.setColClueLabel(col)
         elif self.gameMode is "solving":  # Track the state of the board to match our progress
+            wasSolved = self.nonogramBoard.tracking and self.nonogramBoard.isSolved()
             self.nonogramBoard.updateBoard(row, col, status)
+            if self.nonogramBoard.tracking and self.nonogramBoard.isSolved() and not wasSolved:
+                print("Puzzle complete!")
 
     def setPuzzle(self, validate=False):
         """
         This function analyzes the current game board and creates the puzzle clues
-        :return: #TODO: return false if invalid puzzle, true otherwise
+        :param validate: if True, also check that the puzzle has a unique solution (see validatePuzzle)
         """
         self.nonogramBoard = NonogramBoard.initFromGrid(self.nonogramGrid)
+        self.puzzleLoaded = False
         self.setClueLabels()
+        if validate:
+            self.validatePuzzle()
+
+    def validatePuzzle(self):
+        """
+        Checks on a worker thread that the puzzle has a unique solution, and warns once the check is done if it does
+        not. A loaded puzzle reuses the search made when it was loaded.
+        """
+        self.checkPuzzle(self.onPuzzleValidated)
+
+    def onPuzzleValidated(self, numSolutions, solutions):
+        if numSolutions is None:
+            print("Warning: gave up checking whether this puzzle has a unique solution after " +
+                  str(Settings.puzzleCheckTime) + " seconds")
+        elif numSolutions != 1:
+            print("Warning: this puzzle does not have a unique solution")
+
+    def showAnswerKey(self):
+        """ Draws the answer key of the board on the grid, so that the puzzle can be edited in creation mode """
+        with self.nonogramGrid.batchUpdates():
+            for row in range(self.nonogramBoard.height):
+                for col in range(self.nonogramBoard.width):
+                    status = "yes" if self.nonogramBoard.answerKey[row, col] else "unknown"
+                    self.nonogramGrid.getTile(row, col).setStatus(status)
 
     def setClueLabels(self):
-        """ Set the row clue labels based on the input grid """
-        for i, rowClue in enumerate(self.nonogramBoard.rowClues):
-            label = self.rowClueLabels[i]
-            labelText = ""
-            for j, clue in enumerate(rowClue):
-                if j == 0:
-                    labelText += str(clue)
-                else:
-                    labelText += " " + str(clue)
-            label.configure(text=labelText)
-
-        """ Set the column clue labels based on the input grid """
-        for i, columnClue in enumerate(self.nonogramBoard.colClues):
-            label = self.columnClueLabels[i]
-            labelText = ""
-            for j, clue in enumerate(columnClue):
-                if j == 0:
-                    labelText += str(clue)
-                else:
-                    labelText += "\n" + str(clue)
-            label.configure(text=labelText)
+        """ Set every row and column clue label based on the board """
+        for row in range(len(self.nonogramBoard.rowClues)):
+            self.setRowClueLabel(row)
+        for col in range(len(self.nonogramBoard.colClues)):
+            self.setColClueLabel(col)
+
+    def setRowClueLabel(self, row):
+        """ Set a single row clue label based on the board """
+        labelText = " ".join(str(clue) for clue in self.nonogramBoard.rowClues[row])
+        self.rowClueLabels[row].configure(text=labelText)
+
+    def setColClueLabel(self, col):
+        """ Set a single column clue label based on the board """
+        labelText = "\n".join(str(clue) for clue in self.nonogramBoard.colClues[col])
+        self.columnClueLabels[col].configure(text=labelText)
 
     def switchMode(self):
         if self.gameMode is "creation":
+            if self.puzzleLoaded:  # The grid may be blank, so the loaded puzzle is kept rather than rebuilt from it
+                self.nonogramBoard.resetBoard()
+                self.validatePuzzle()
+            else:
+                self.setPuzzle(validate=True)
             self.nonogramGrid.resetGrid()
             self.gameMode = "solving"
             self.modeLabel.configure(text="Mode: Solving")
@@ -263,7 +417,13 @@ class NonogramGame(tk.Frame):
             self.showCheckButton()
 
         elif self.gameMode is "solving":
-            self.setPuzzle(validate=True)
+            if self.puzzleLoaded:
+                if self.nonogramBoard.tracking:
+                    self.showAnswerKey()
+                else:
+                    self.nonogramGrid.resetGrid()
+            else:
+                self.setPuzzle(validate=True)
             self.gameMode = "creation"
             self.modeLabel.configure(text="Mode: Creating")
 
@@ -0,0 +1,156 @@
+"""
+Filename: nonogram_generator.py
+Date Created: 10/18/2026
+
+Generates new puzzles by sampling random grids and keeping those whose clues have a unique solution. Grids are tried in
+parallel across a pool of processes, and the puzzles are written as .puz files or streamed into a puzzle library:
+    python nonogram_generator.py 100 --size 15 15 --output-dir generated
+    python nonogram_generator.py 10000 --size 20 20 --density 0.6 --line-solvable --library generated.lib
+"""
+
+import argparse
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_board import cluesFromAnswerKey
+from nonogram_library import writeLibrary
+from nonogram_line_cache import sharedLineCache
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_puzzle_file import writePuzzleFile
+
+
+def randomAnswerKey(height, width, density, seed):
+    """
+    :param density: chance of each cell being filled
+    :param seed: seed of the random grid, so every grid can be regenerated from its seed
+    :return: boolean array of size (height, width)
+    """
+    return np.random.default_rng(seed).random((height, width)) < density
+
+
+def checkUnique(rowClues, colClues, lineSolvable=False, maxSteps=None):
+    """
+    Checks whether clues have a unique solution. Line solving alone is tried first, since it proves uniqueness without
+    any search when it fills in the whole board.
+    :param lineSolvable: if True, only accept clues that line solving alone solves
+    :param maxSteps: give up on clues that take more than this many steps to search (None for no limit)
+    :return: (unique, lineSolved), where lineSolved is True if no guesses were needed
+    """
+    solver = NonogramPropagationSolver(NonogramBitBoard.initFromClues(rowClues, colClues), lineCache=sharedLineCache)
+    solver.verbose = False
+    solver.start(limit=2)
+    consistent = solver.propagate()
+    if not consistent:
+        return False, False
+    if solver.getBranchCell()[0] is None:
+        return True, True
+    if lineSolvable:
+        return False, False
+    finished = solver.resume(maxSteps=maxSteps)
+    return finished and len(solver.solutions) == 1, False
+
+
+def tryGrid(task):
+    """
+    Samples one grid and checks whether its clues make a valid puzzle. This runs in the worker processes.
+    :param task: (height, width, density, seed, lineSolvable, maxSteps)
+    :return: (seed, rowClues, colClues, answerKey) if the puzzle is accepted, or None
+    """
+    height, width, density, seed, lineSolvable, maxSteps = task
+    answerKey = randomAnswerKey(height, width, density, seed)
+    rowClues, colClues = cluesFromAnswerKey(answerKey)
+    unique, lineSolved = checkUnique(rowClues, colClues, lineSolvable, maxSteps)
+    if not unique:
+        return None
+    return seed, rowClues, colClues, answerKey
+
+
+def generatePuzzles(count, height, width, density=0.5, lineSolvable=False, maxSteps=None, seed=0, processes=None,
+                    batchSize=256, maxAttempts=None):
+    """
+    Generates puzzles with a unique solution. Grids are handed to the pool in batches, so that no more than a batch
+    of extra grids is tried once enough puzzles have been found.
+    :param count: number of puzzles to generate
+    :param density: chance of each cell being filled
+    :param lineSolvable: if True, only keep puzzles that line solving alone solves
+    :param maxSteps: skip grids that take more than this many search steps to check (None for no limit)
+    :param seed: seed of the first grid. Grid i uses seed + i, so a run can be reproduced.
+    :param processes: number of worker processes (None for the number of cores)
+    :param batchSize: number of grids handed to the pool at a time
+    :param maxAttempts: number of grids to try before giving up (None for 1000 per puzzle asked for)
+    :return: generator of (name, rowClues, colClues, answerKey)
+    :raises RuntimeError: if fewer than count puzzles are found in maxAttempts grids, e.g. when the filters reject
+        nearly every grid of this size and density
+    """
+    if maxAttempts is None:
+        maxAttempts = 1000 * count
+    numFound = 0
+    nextSeed = seed
+    with Pool(processes=processes) as pool:
+        while numFound < count:
+            if nextSeed - seed >= maxAttempts:
+                raise RuntimeError("Only found " + str(numFound) + " of " + str(count) + " puzzles in " +
+                                   str(maxAttempts) + " attempts")
+            lastSeed = min(nextSeed + batchSize, seed + maxAttempts)
+            tasks = [(height, width, density, s, lineSolvable, maxSteps) for s in range(nextSeed, lastSeed)]
+            nextSeed = lastSeed
+            for result in pool.imap_unordered(tryGrid, tasks, chunksize=8):
+                if result is None:
+                    continue
+                gridSeed, rowClues, colClues, answerKey = result
+                yield "gen_" + str(height) + "x" + str(width) + "_" + str(gridSeed), rowClues, colClues, answerKey
+                numFound += 1
+                if numFound >= count:
+                    break
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate random puzzles that have a unique solution.")
+    parser.add_argument("count", type=int, help="number of puzzles to generate")
+    parser.add_argument("--size", type=int, nargs=2, default=[15, 15], metavar=("ROWS", "COLS"),
+                        help="size of the puzzles (default: 15 15)")
+    parser.add_argument("--density", type=float, default=0.5, help="chance of each cell being filled (default: 0.5)")
+    parser.add_argument("--line-solvable", action="store_true",
+                        help="only keep puzzles that can be solved by line logic alone, without guessing")
+    parser.add_argument("--max-steps", type=int, default=100000,
+                        help="skip grids that take more search steps than this to check (default: 100000)")
+    parser.add_argument("--max-attempts", type=int, default=None,
+                        help="give up after trying this many grids (default: 1000 per puzzle)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first grid (default: 0)")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of cores)")
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--output-dir", help="write each puzzle to a .puz file in this directory")
+    output.add_argument("--library", help="write the puzzles, with their solutions, to this puzzle library")
+    args = parser.parse_args(argv)
+    if args.max_attempts is not None and args.max_attempts < 1:
+        parser.error("--max-attempts must be at least 1")
+
+    startTime = time.perf_counter()
+    height, width = args.size
+    puzzles = generatePuzzles(args.count, height, width, args.density, args.line_solvable, args.max_steps,
+                              args.seed, args.processes, maxAttempts=args.max_attempts)
+    try:
+        if args.library:
+            numPuzzles = writeLibrary(args.library, puzzles)
+        else:
+            os.makedirs(args.output_dir, exist_ok=True)
+            numPuzzles = 0
+            for name, rowClues, colClues, answerKey in puzzles:
+                writePuzzleFile(os.path.join(args.output_dir, name + ".puz"), rowClues, colClues)
+                numPuzzles += 1
+    except RuntimeError as e:
+        print("Error: " + str(e), file=sys.stderr)
+        return 1
+    print("Generated " + str(numPuzzles) + " puzzles in " + "{:.1f}".format(time.perf_counter() - startTime) + "s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
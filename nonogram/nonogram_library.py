@@ -0,0 +1,340 @@
+"""
+Filename: nonogram_library.py
+Date Created: 10/18/2026
+
+A packed library format that stores many puzzles in one file. The file is memory-mapped, so a single puzzle can be read
+by index or by name without parsing the rest of the library:
+    python nonogram_library.py pack puzzles.lib "puzzles/*.puz"
+    python nonogram_library.py unpack puzzles.lib out_dir
+
+Layout (all integers little-endian):
+    header   magic "NGLB", version (uint16), reserved (uint16), number of puzzles (uint32), index offset (uint64),
+             name table offset (uint64)
+    records  one per puzzle, back to back:
+                 name length and UTF-8 name, height, width, flags (bit 0 set if a solution is stored)
+                 each row clue then each col clue, as the number of blocks followed by the blocks
+                 the solution, if stored, as height * width bits packed row-major with np.packbits
+             every number above except flags is an unsigned LEB128 varint
+    index    (record offset uint64, record length uint32) for each puzzle, so record i is found without reading any
+             other record
+    names    (name hash uint64, puzzle index uint32) for each puzzle, sorted by hash and then index, so a puzzle is found
+             by name with a binary search that only decodes the names of records whose hash matches
+An empty line is stored as a clue with no blocks, and read back as the [0] placeholder clue used on NonogramBoard.
+"""
+
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from nonogram_puzzle_file import findPuzzleFiles, readPuzzleFile, writePuzzleFile
+
+MAGIC = b"NGLB"
+VERSION = 2
+HEADER = struct.Struct("<4sHHIQQ")
+INDEX_ENTRY = struct.Struct("<QI")
+NAME_ENTRY = struct.Struct("<QI")
+FLAG_SOLUTION = 1
+
+
+def encodeVarint(number, out):
+    """
+    Appends an unsigned LEB128 varint to a bytearray
+    :param number: non-negative integer to encode
+    :param out: bytearray to append to
+    """
+    while number >= 0x80:
+        out.append((number & 0x7F) | 0x80)
+        number >>= 7
+    out.append(number)
+
+
+def decodeVarint(data, pos):
+    """
+    :param data: bytes-like object holding the varint
+    :param pos: position of the first byte of the varint
+    :return: (number, position after the varint)
+    """
+    number = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint in puzzle library")
+        byte = data[pos]
+        pos += 1
+        number |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return number, pos
+        shift += 7
+
+
+def hashName(name):
+    """
+    :param name: name of a puzzle
+    :return: 64-bit hash of the name that is the same on every run and platform, unlike hash()
+    """
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def encodePuzzle(name, rowClues, colClues, solution=None):
+    """
+    Encodes a single puzzle as a library record
+    :param name: name of the puzzle
+    :param rowClues: row clues of the puzzle
+    :param colClues: col clues of the puzzle
+    :param solution: optional boolean array of size (rows, cols) of the filled cells
+    :return: the record as bytes
+    """
+    out = bytearray()
+    nameBytes = name.encode("utf-8")
+    encodeVarint(len(nameBytes), out)
+    out += nameBytes
+    encodeVarint(len(rowClues), out)
+    encodeVarint(len(colClues), out)
+    out.append(FLAG_SOLUTION if solution is not None else 0)
+    for clue in list(rowClues) + list(colClues):
+        blocks = [block for block in clue if block > 0]
+        encodeVarint(len(blocks), out)
+        for block in blocks:
+            encodeVarint(block, out)
+    if solution is not None:
+        solution = np.asarray(solution, dtype=bool)
+        if solution.shape != (len(rowClues), len(colClues)):
+            raise ValueError("Solution of " + name + " does not match the size of its clues")
+        out += np.packbits(solution.ravel()).tobytes()
+    return bytes(out)
+
+
+def writeLibrary(path, puzzles):
+    """
+    Writes a puzzle library. Records are streamed to the file, so the puzzles do not all need to be in memory at once.
+    :param path: path of the library file
+    :param puzzles: iterable of (name, rowClues, colClues, solution) tuples, where solution may be None
+    :return: number of puzzles written
+    """
+    index = []
+    names = []
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, 0, 0, 0))  # Filled in once the index has been written
+        offset = HEADER.size
+        for name, rowClues, colClues, solution in puzzles:
+            record = encodePuzzle(name, rowClues, colClues, solution)
+            f.write(record)
+            names.append((hashName(name), len(index)))
+            index.append((offset, len(record)))
+            offset += len(record)
+
+        indexOffset = offset
+        for entry in index:
+            f.write(INDEX_ENTRY.pack(*entry))
+        nameTableOffset = indexOffset + len(index) * INDEX_ENTRY.size
+        names.sort()
+        for entry in names:
+            f.write(NAME_ENTRY.pack(*entry))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(index), indexOffset, nameTableOffset))
+    return len(index)
+
+
+class PuzzleLibrary:
+    """
+    Read access to a puzzle library file. Only the header is read when the library is opened; each puzzle is decoded
+    from the memory map when it is asked for.
+    """
+    def __init__(self, path):
+        """
+        :param path: path of the library file
+        """
+        self.path = path
+        self.file = open(path, "rb")
+        try:
+            self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # An empty file can't be mapped
+            self.file.close()
+            raise ValueError(path + " is not a puzzle library")
+
+        if len(self.data) < HEADER.size:
+            self.close()
+            raise ValueError(path + " is not a puzzle library")
+        magic, version = struct.unpack_from("<4sH", self.data, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(path + " is not a puzzle library")
+        if version != VERSION:
+            self.close()
+            raise ValueError(path + " has unsupported library version " + str(version))
+        reserved, self.numPuzzles, self.indexOffset, self.nameTableOffset = HEADER.unpack_from(self.data, 0)[2:]
+        if (self.indexOffset + self.numPuzzles * INDEX_ENTRY.size > len(self.data) or
+                self.nameTableOffset + self.numPuzzles * NAME_ENTRY.size > len(self.data)):
+            self.close()
+            raise ValueError(path + " is truncated")
+
+    def __len__(self):
+        return self.numPuzzles
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def getRecordOffset(self, index):
+        if not 0 <= index < self.numPuzzles:
+            raise IndexError("Puzzle index " + str(index) + " out of range")
+        offset, length = INDEX_ENTRY.unpack_from(self.data, self.indexOffset + index * INDEX_ENTRY.size)
+        return offset
+
+    def readHeader(self, index):
+        """
+        :return: (name, height, width, flags, position of the first clue) of a record
+        """
+        pos = self.getRecordOffset(index)
+        nameLength, pos = decodeVarint(self.data, pos)
+        name = self.data[pos:pos + nameLength].decode("utf-8")
+        pos += nameLength
+        height, pos = decodeVarint(self.data, pos)
+        width, pos = decodeVarint(self.data, pos)
+        flags = self.data[pos]
+        return name, height, width, flags, pos + 1
+
+    def getName(self, index):
+        """
+        :return: name of the puzzle at the given index
+        """
+        return self.readHeader(index)[0]
+
+    def getPuzzle(self, index):
+        """
+        Reads the clues of a single puzzle
+        :param index: index of the puzzle in the library
+        :return: (rowClues, colClues)
+        """
+        return self.readRecord(index)[1:3]
+
+    def getSolution(self, index):
+        """
+        :param index: index of the puzzle in the library
+        :return: boolean array of size (rows, cols) of the filled cells, or None if no solution is stored
+        """
+        return self.readRecord(index)[3]
+
+    def readRecord(self, index):
+        """
+        :return: (name, rowClues, colClues, solution) of the puzzle at the given index, where solution may be None
+        """
+        name, height, width, flags, pos = self.readHeader(index)
+        clues = []
+        for i in range(height + width):
+            numBlocks, pos = decodeVarint(self.data, pos)
+            clue = []
+            for j in range(numBlocks):
+                block, pos = decodeVarint(self.data, pos)
+                clue.append(block)
+            clues.append(clue if clue else [0])
+
+        solution = None
+        if flags & FLAG_SOLUTION:
+            numBytes = (height * width + 7) // 8
+            bits = np.frombuffer(self.data[pos:pos + numBytes], dtype=np.uint8)  # Copied, so the map can be closed
+            solution = np.unpackbits(bits, count=height * width).astype(bool).reshape(height, width)
+        return name, clues[:height], clues[height:], solution
+
+    def getNameEntry(self, position):
+        """
+        :return: (name hash, puzzle index) at the given position of the sorted name table
+        """
+        return NAME_ENTRY.unpack_from(self.data, self.nameTableOffset + position * NAME_ENTRY.size)
+
+    def indexOf(self, name):
+        """
+        Binary searches the name table for the hash of the name. Only the records whose hash matches are decoded, to
+        rule out hash collisions.
+        :param name: name of a puzzle in the library
+        :return: index of the first puzzle with that name
+        """
+        nameHash = hashName(name)
+        low, high = 0, self.numPuzzles
+        while low < high:
+            middle = (low + high) // 2
+            if self.getNameEntry(middle)[0] < nameHash:
+                low = middle + 1
+            else:
+                high = middle
+        # Entries with the same hash are sorted by index, so the first one whose name matches is the first puzzle
+        for position in range(low, self.numPuzzles):
+            entryHash, index = self.getNameEntry(position)
+            if entryHash != nameHash:
+                break
+            if self.getName(index) == name:
+                return index
+        raise KeyError("No puzzle named " + name + " in " + self.path)
+
+    def getPuzzleByName(self, name):
+        """
+        :return: (rowClues, colClues) of the puzzle with the given name
+        """
+        return self.getPuzzle(self.indexOf(name))
+
+    def __iter__(self):
+        """ Yields (name, rowClues, colClues, solution) for every puzzle, in order """
+        for index in range(self.numPuzzles):
+            yield self.readRecord(index)
+
+
+def puzToLibrary(puzzleFiles, path):
+    """
+    Packs .puz files into a library. Each puzzle is named after its file, without the extension.
+    :param puzzleFiles: list of .puz file paths
+    :param path: path of the library file to write
+    :return: number of puzzles written
+    """
+    def puzzles():
+        for puzzleFile in puzzleFiles:
+            rowClues, colClues = readPuzzleFile(puzzleFile)
+            yield os.path.splitext(os.path.basename(puzzleFile))[0], rowClues, colClues, None
+    return writeLibrary(path, puzzles())
+
+
+def libraryToPuz(path, directory):
+    """
+    Unpacks every puzzle of a library into a .puz file named after the puzzle. Any directories in a name are dropped, so
+    a library can't write files outside of the directory.
+    :param path: path of the library file
+    :param directory: directory to write the .puz files to
+    :return: number of puzzles written
+    """
+    os.makedirs(directory, exist_ok=True)
+    with PuzzleLibrary(path) as library:
+        for name, rowClues, colClues, solution in library:
+            fileName = os.path.basename(name.replace("\\", "/")) + ".puz"
+            writePuzzleFile(os.path.join(directory, fileName), rowClues, colClues)
+        return len(library)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert between .puz files and packed puzzle libraries.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    packParser = subparsers.add_parser("pack", help="pack .puz files into a library")
+    packParser.add_argument("library", help="library file to write")
+    packParser.add_argument("paths", nargs="+", help=".puz files, directories of .puz files, or glob patterns")
+    unpackParser = subparsers.add_parser("unpack", help="unpack a library into .puz files")
+    unpackParser.add_argument("library", help="library file to read")
+    unpackParser.add_argument("directory", help="directory to write the .puz files to")
+    args = parser.parse_args(argv)
+
+    if args.command == "pack":
+        numPuzzles = puzToLibrary(findPuzzleFiles(args.paths), args.library)
+    else:
+        numPuzzles = libraryToPuz(args.library, args.directory)
+    print(str(numPuzzles) + " puzzles written")
+
+
+if __name__ == "__main__":
+    main()
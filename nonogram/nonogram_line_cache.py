@@ -0,0 +1,84 @@
+"""
+Filename: nonogram_line_cache.py
+Date Created: 10/18/2026
+"""
+
+import sys
+from collections import OrderedDict
+
+from nonogram_line_solver import solveLine
+
+# Rough bytes used by the OrderedDict's own bookkeeping for each entry, on top of the key and value objects
+ENTRY_OVERHEAD = 100
+
+
+class LineSolverCache:
+    """
+    A bounded LRU memo of line solving results. The same clue and partially known line come up over and over, both
+    within a search and across puzzles, so the result of the line solver is remembered for each (clue, line) pair.
+    Keys are compact: the clue as a tuple and the line as one byte per cell. The cache keeps a running estimate of
+    the memory it uses, and evicts the least recently used results once that goes over maxBytes.
+    """
+    def __init__(self, maxBytes=32 * 1024 * 1024, lineSolver=solveLine):
+        """
+        :param maxBytes: memory budget of the cache
+        :param lineSolver: line solving function to memoize, lineSolver(clue, line) -> solved line or None
+        """
+        self.maxBytes = maxBytes
+        self.lineSolver = lineSolver
+        self.entries = OrderedDict()
+        self.numBytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def solve(self, clue, line):
+        """
+        Line solves a line, using the remembered result if this clue and line have been solved before.
+        :param clue: row/col clue of the line
+        :param line: list of board numbers for the line
+        :return: a new list of board numbers with the forced cells filled in, or None if no placement fits the line
+        """
+        key = (tuple(clue), bytes(line))
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            solved = self.entries[key]
+            return None if solved is None else list(solved)
+
+        self.misses += 1
+        solved = self.lineSolver(clue, line)
+        value = None if solved is None else bytes(solved)
+        self.entries[key] = value
+        self.numBytes += self.entrySize(key, value)
+        while self.numBytes > self.maxBytes and self.entries:
+            oldKey, oldValue = self.entries.popitem(last=False)
+            self.numBytes -= self.entrySize(oldKey, oldValue)
+            self.evictions += 1
+        return solved
+
+    @staticmethod
+    def entrySize(key, value):
+        return ENTRY_OVERHEAD + sys.getsizeof(key) + sys.getsizeof(key[0]) + sys.getsizeof(key[1]) + \
+            sys.getsizeof(value)
+
+    def clear(self):
+        """ Forgets every result. The statistics are kept. """
+        self.entries.clear()
+        self.numBytes = 0
+
+    def getStats(self):
+        """
+        :return: dict of the cache's hits, misses, evictions, number of entries and estimated bytes used
+        """
+        lookups = self.hits + self.misses
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hitRate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self.entries),
+                "bytes": self.numBytes}
+
+
+# Cache shared by every solve in this process, so that batch runs reuse results across puzzles
+sharedLineCache = LineSolverCache()
@@ -0,0 +1,409 @@
+"""
+Filename: nonogram_line_solver.py
+Date Created: 10/18/2026
+"""
+
+from functools import lru_cache
+from itertools import combinations
+from math import comb
+
+import numpy as np
+
+# Board numbers used for each cell of a line. These match NonogramBoard.status2boardNumber
+UNKNOWN = 0
+NO = 1
+YES = 2
+
+BOARD_NUMBER_TO_STATUS = ["unknown", "no", "yes"]
+
+
+def normalizeClue(clue):
+    """
+    Strips the placeholder [0] clue used for empty lines, so that an empty line has no blocks to place.
+    :param clue: row/col clue as stored on a NonogramBoard
+    :return: list of block lengths
+    """
+    return [block for block in clue if block > 0]
+
+
+def solveLine(clue, line):
+    """
+    Finds every cell of a line that is forced by the clue. A cell is forced if it takes the same value in every legal
+    placement of the clue's blocks that agrees with the cells that are already known.
+    This uses a dynamic program over (block index, cell index), so it runs in O(len(clue) * len(line)).
+    :param clue: row/col clue of the line
+    :param line: list of board numbers (UNKNOWN, NO, YES) for the line
+    :return: a new list of board numbers with the forced cells filled in, or None if no placement fits the line
+    """
+    blocks = normalizeClue(clue)
+    numBlocks = len(blocks)
+    length = len(line)
+
+    # noCount[i] is the number of NO cells in line[:i], so a block can cover line[i:j] if noCount[j] == noCount[i]
+    noCount = [0] * (length + 1)
+    for i, status in enumerate(line):
+        noCount[i + 1] = noCount[i] + (status == NO)
+
+    # canFit[j][i] is True if blocks[j:] can be placed in line[i:]
+    canFit = [[False] * (length + 2) for _ in range(numBlocks + 1)]
+    canFit[numBlocks][length] = True
+    canFit[numBlocks][length + 1] = True
+    for i in range(length - 1, -1, -1):
+        canFit[numBlocks][i] = canFit[numBlocks][i + 1] and line[i] != YES
+    for j in range(numBlocks - 1, -1, -1):
+        block = blocks[j]
+        for i in range(length - 1, -1, -1):
+            fits = False
+            if line[i] != YES and canFit[j][i + 1]:  # Leave cell i empty
+                fits = True
+            else:
+                end = i + block
+                if end <= length and noCount[end] == noCount[i]:  # Start block j at cell i
+                    if end == length:
+                        fits = canFit[j + 1][end]
+                    elif line[end] != YES:
+                        fits = canFit[j + 1][end + 1]
+            canFit[j][i] = fits
+
+    if not canFit[0][0]:
+        return None
+
+    # Walk forward through every reachable state, marking which values each cell can take
+    canBeYes = [False] * length
+    canBeNo = [False] * length
+    reached = [[False] * (length + 2) for _ in range(numBlocks + 1)]
+    reached[0][0] = True
+    for i in range(length):
+        for j in range(numBlocks + 1):
+            if not reached[j][i] or not canFit[j][i]:
+                continue
+            if line[i] != YES and canFit[j][i + 1]:
+                canBeNo[i] = True
+                reached[j][i + 1] = True
+            if j < numBlocks:
+                end = i + blocks[j]
+                if end > length or noCount[end] != noCount[i]:
+                    continue
+                if end == length:
+                    if canFit[j + 1][end]:
+                        for k in range(i, end):
+                            canBeYes[k] = True
+                        reached[j + 1][end] = True
+                elif line[end] != YES and canFit[j + 1][end + 1]:
+                    for k in range(i, end):
+                        canBeYes[k] = True
+                    canBeNo[end] = True
+                    reached[j + 1][end + 1] = True
+
+    solved = list(line)
+    for i in range(length):
+        if canBeYes[i] and not canBeNo[i]:
+            solved[i] = YES
+        elif canBeNo[i] and not canBeYes[i]:
+            solved[i] = NO
+    return solved
+
+
+def countPlacements(clue, line):
+    """
+    Counts the legal placements of a clue's blocks that agree with the cells of a line that are already known.
+    :param clue: row/col clue of the line
+    :param line: list of board numbers (UNKNOWN, NO, YES) for the line
+    :return: number of placements
+    """
+    blocks = normalizeClue(clue)
+    numBlocks = len(blocks)
+    length = len(line)
+
+    noCount = [0] * (length + 1)
+    for i, status in enumerate(line):
+        noCount[i + 1] = noCount[i] + (status == NO)
+
+    # ways[i] is the number of placements of blocks[j:] in line[i:], for the block j of the current pass
+    ways = [0] * (length + 2)
+    ways[length] = 1
+    ways[length + 1] = 1
+    for i in range(length - 1, -1, -1):
+        ways[i] = ways[i + 1] if line[i] != YES else 0
+    for j in range(numBlocks - 1, -1, -1):
+        block = blocks[j]
+        nextWays = ways
+        ways = [0] * (length + 2)
+        for i in range(length - 1, -1, -1):
+            count = ways[i + 1] if line[i] != YES else 0  # Leave cell i empty
+            end = i + block
+            if end <= length and noCount[end] == noCount[i]:  # Start block j at cell i
+                if end == length:
+                    count += nextWays[end]
+                elif line[end] != YES:
+                    count += nextWays[end + 1]
+            ways[i] = count
+    return ways[0]
+
+
+# Each byte value with its bits in reverse order
+BIT_REVERSED_BYTES = bytes(int(format(value, "08b")[::-1], 2) for value in range(256))
+
+
+def reverseBits(mask, length):
+    """
+    :return: the mask with bit i moved to bit length - 1 - i, for every bit below length
+    """
+    numBytes = (length + 7) // 8
+    reversedBytes = mask.to_bytes(numBytes, "little").translate(BIT_REVERSED_BYTES)
+    return int.from_bytes(reversedBytes, "big") >> (numBytes * 8 - length)
+
+
+def fillRight(seeds, open):
+    """
+    Spreads each seed bit to the right (towards higher bits) through the open cells, in one addition: adding a seed to
+    its run of open cells carries through the rest of the run.
+    :param seeds: bitmask of positions
+    :param open: bitmask of open cells
+    :return: every position p with some seed s <= p and no closed cell in [s, p). This is the seeds, and for a seed on
+    an open cell, the rest of its run and the closed position just past it.
+    """
+    openSeeds = seeds & open
+    return ((open + openSeeds) ^ open ^ openSeeds) | seeds
+
+
+def blockStarts(block, notEmpty, filled):
+    """
+    :return: bitmask of the cells a block can start at on its own: the block only covers cells that are not empty, and
+    the cells just before and after it are not filled
+    """
+    starts = notEmpty
+    covered = 1
+    while covered < block:  # starts has bit i set if cells i to i + covered - 1 are not empty
+        step = min(covered, block - covered)
+        starts &= starts >> step
+        covered += step
+    return starts & ~(filled << 1) & ~(filled >> block)
+
+
+def prefixStarts(blocks, filled, empty, length):
+    """
+    :return: list of bitmasks, one per block, of the cells it can start at with every block before it placed legally,
+    or None if the blocks cannot all be placed
+    """
+    full = (1 << length) - 1
+    open = full & ~filled
+    notEmpty = full & ~empty
+    startsByLength = {}
+    allStarts = []
+    seeds = 1  # The first block can start at any cell with no filled cell before it
+    for block in blocks:
+        if block not in startsByLength:
+            startsByLength[block] = blockStarts(block, notEmpty, filled)
+        starts = fillRight(seeds, open) & startsByLength[block]
+        if not starts:
+            return None
+        allStarts.append(starts)
+        seeds = starts << (block + 1)
+    return allStarts
+
+
+@lru_cache(maxsize=1 << 16)
+def solveLineMasks(blocks, filled, empty, length):
+    """
+    Does the same as solveLine, on a line packed into bitmasks as NonogramBitBoard stores it, without unpacking it.
+    Each block's legal starts are found for all cells at once with shifts and adds: a pass from the left finds where a
+    block can start with the blocks before it placed, and the same pass over the reversed line finds where it can start
+    with the blocks after it placed. A start that both allow is part of some legal placement. The work is a few integer
+    operations per block rather than per cell, and results are cached, since searches revisit the same line states.
+    :param blocks: tuple of block lengths of the clue (see normalizeClue)
+    :param filled: bitmask of the line's YES cells, bit i for cell i
+    :param empty: bitmask of the line's NO cells
+    :param length: number of cells in the line
+    :return: (filled, empty) bitmasks with the forced cells added, or None if no placement fits the line
+    """
+    full = (1 << length) - 1
+    if not blocks:
+        return None if filled else (filled, full)
+    open = full & ~filled
+    starts = prefixStarts(blocks, filled, empty, length)
+    if starts is None or not fillRight(starts[-1] << blocks[-1], open) >> length & 1:
+        return None
+    reversedFilled = reverseBits(filled, length)
+    reversedOpen = full & ~reversedFilled
+    reversedStarts = prefixStarts(blocks[::-1], reversedFilled, reverseBits(empty, length), length)
+
+    # For each block, the starts the blocks after it allow, and the open cells that reach one of them, are found on the
+    # reversed line. They are packed into one integer so that they can all be reversed back at once.
+    packed = 0
+    for block, suffixStarts in zip(blocks, reversed(reversedStarts)):
+        packed = packed << length | (fillRight(suffixStarts << block, reversedOpen) & reversedOpen)
+        packed = packed << length | suffixStarts
+    unpacked = reverseBits(packed, 2 * len(blocks) * length)
+
+    canBeYes = 0
+    canBeNo = 0
+    ends = 1  # Cells just past the previous block, or cell 0 for the first block
+    for i, block in enumerate(blocks):
+        leadsToBlock = unpacked & full
+        suffixStarts = (unpacked >> length & full) >> (block - 1)  # A reversed start is the last cell of the block
+        unpacked >>= 2 * length
+        canBeNo |= fillRight(ends, open) & leadsToBlock  # The gap before the block
+        covered = starts[i] & suffixStarts
+        coveredLength = 1
+        while coveredLength < block:
+            step = min(coveredLength, block - coveredLength)
+            covered |= covered << step
+            coveredLength += step
+        canBeYes |= covered
+        ends = starts[i] << block
+    canBeNo |= fillRight(ends, open) & open & ~((1 << filled.bit_length()) - 1)  # The gap after the last block
+    return filled | (canBeYes & ~canBeNo), empty | (canBeNo & ~canBeYes)
+
+
+# Masking a placement matrix beats solveLine up to about this many placements per (block, cell) pair that solveLine
+# visits, measured with NonogramVectorizedSolver on the bundled puzzles and random 30x30 and 40x40 puzzles
+PLACEMENTS_PER_STATE = 2
+
+
+def maxPlacements(numBlocks, length):
+    """
+    :return: the most placements a line can have before solveLine is cheaper than masking its placement matrix. This
+    grows with the length of the line and the number of blocks, like the work solveLine does.
+    """
+    return PLACEMENTS_PER_STATE * (numBlocks + 1) * length
+
+
+@lru_cache(maxsize=4096)
+def placementMatrix(clue, length):
+    """
+    Builds every placement of a clue's blocks in an empty line as the rows of a boolean matrix. Placements are found
+    by choosing how much of the line's slack goes before each block, which is a combination of the blocks and the
+    slack cells. Rows are packed 8 cells to a byte with np.packbits, which keeps the matrix small enough to cache and
+    makes masking it 8 times cheaper. The result is cached, since it only depends on the clue and the length of the line.
+    :param clue: row/col clue of the line, as a tuple
+    :param length: number of cells in the line
+    :return: (numPlacements, ceil(length / 8)) uint8 array of packed placements (a set bit is a filled cell), or None
+    if there are more than maxPlacements placements
+    """
+    blocks = normalizeClue(clue)
+    numBlocks = len(blocks)
+    slack = length - sum(blocks) - max(numBlocks - 1, 0)
+    if slack < 0:
+        return np.packbits(np.zeros((0, length), dtype=bool), axis=1)
+    if numBlocks == 0:
+        return np.packbits(np.zeros((1, length), dtype=bool), axis=1)
+    if comb(slack + numBlocks, numBlocks) > maxPlacements(numBlocks, length):
+        return None
+
+    # Block j starts after the blocks and gaps before it, plus however much slack has been used up so far
+    offsets = np.cumsum([0] + [block + 1 for block in blocks[:-1]])
+    choices = np.array(list(combinations(range(slack + numBlocks), numBlocks)), dtype=np.intp)
+    starts = choices - np.arange(numBlocks) + offsets
+    ends = starts + np.array(blocks)
+
+    # Mark +1 where each block starts and -1 where it ends, so the running sum is 1 inside blocks and 0 elsewhere
+    edges = np.zeros((len(choices), length + 1), dtype=np.int8)
+    placementIdx = np.arange(len(choices))[:, None]
+    edges[placementIdx, starts] += 1
+    edges[placementIdx, ends] -= 1
+    return np.packbits(np.cumsum(edges[:, :length], axis=1).astype(bool), axis=1)
+
+
+def packLines(lines):
+    """
+    :param lines: array of board numbers, one line per row
+    :return: (filled, empty) packed bitmasks of the YES and NO cells of each line, to match placementMatrix
+    """
+    lines = np.asarray(lines)
+    return np.packbits(lines == YES, axis=-1), np.packbits(lines == NO, axis=-1)
+
+
+def solveLineVectorized(clue, line):
+    """
+    Does the same as solveLine, by masking the placement matrix of the clue with the known cells of the line in one
+    step and reducing the consistent placements with bitwise and/or. This beats solveLine when the clue is short for
+    the line.
+    :param clue: row/col clue of the line
+    :param line: list or array of board numbers (UNKNOWN, NO, YES) for the line
+    :return: a new list of board numbers with the forced cells filled in, or None if no placement fits the line
+    """
+    placements = placementMatrix(tuple(clue), len(line))
+    if placements is None:
+        return solveLine(clue, list(line))
+
+    line = np.asarray(line)
+    filled, empty = packLines(line)
+    consistent = ~((placements & empty).any(axis=1) | (~placements & filled).any(axis=1))
+    valid = placements[consistent]
+    if len(valid) == 0:
+        return None
+
+    solved = line.copy()
+    solved[np.unpackbits(np.bitwise_and.reduce(valid, axis=0), count=len(line)).astype(bool)] = YES
+    solved[~np.unpackbits(np.bitwise_or.reduce(valid, axis=0), count=len(line)).astype(bool)] = NO
+    return solved.tolist()
+
+
+@lru_cache(maxsize=64)
+def stackedPlacements(clues, length):
+    """
+    Stacks the placement matrices of a set of lines into one matrix, so that they can all be solved at once.
+    :param clues: tuple of clues (as tuples) of lines of the same length
+    :return: (placements, owner, starts, fallback): the stacked packed matrix, the index of the line each placement
+    belongs to, the first row of each line's placements, and the indexes of lines with too many placements to stack
+    """
+    matrices = []
+    owners = []
+    starts = []
+    fallback = []
+    numRows = 0
+    for i, clue in enumerate(clues):
+        matrix = placementMatrix(clue, length)
+        if matrix is None:
+            fallback.append(i)
+            matrix = np.zeros((0, (length + 7) // 8), dtype=np.uint8)
+        starts.append(numRows)
+        matrices.append(matrix)
+        owners.append(np.full(len(matrix), i, dtype=np.intp))
+        numRows += len(matrix)
+    return np.concatenate(matrices), np.concatenate(owners), np.array(starts, dtype=np.intp), fallback
+
+
+def solveLinesVectorized(clues, lines):
+    """
+    Line solves a batch of lines of the same length at once, e.g. every row of a board. The known cells of each line
+    are broadcast over its placements, and the consistent placements of each line are reduced with segmented bitwise
+    and/or, so a cell is forced filled if every consistent placement of its line fills it, and forced empty if none does.
+    :param clues: list of the clues of the lines
+    :param lines: (numLines, length) array of board numbers
+    :return: (numLines, length) array of board numbers with the forced cells filled in, or None if some line has no
+    legal placement
+    """
+    lines = np.asarray(lines)
+    numLines, length = lines.shape
+    placements, owner, starts, fallback = stackedPlacements(tuple(tuple(clue) for clue in clues), length)
+
+    filled, empty = packLines(lines)
+    consistent = ~((placements & empty[owner]).any(axis=1) | (~placements & filled[owner]).any(axis=1))
+    numValid = np.bincount(owner[consistent], minlength=numLines)
+
+    stacked = np.ones(numLines, dtype=bool)
+    stacked[fallback] = False
+    if (numValid[stacked] == 0).any():
+        return None
+
+    solved = lines.copy()
+    if stacked.any():
+        # Inconsistent placements are replaced by the identity of each reduction, so they cannot affect the result.
+        # Fallback lines have no rows in the stacked matrix, and reduceat needs every segment to be non-empty, so only
+        # the stacked lines are reduced.
+        segments = starts[stacked]
+        allFilled = np.bitwise_and.reduceat(np.where(consistent[:, None], placements, 0xFF), segments, axis=0)
+        anyFilled = np.bitwise_or.reduceat(np.where(consistent[:, None], placements, 0), segments, axis=0)
+        stackedSolved = solved[stacked]
+        stackedSolved[np.unpackbits(allFilled, axis=1, count=length).astype(bool)] = YES
+        stackedSolved[~np.unpackbits(anyFilled, axis=1, count=length).astype(bool)] = NO
+        solved[stacked] = stackedSolved
+
+    for i in fallback:
+        line = solveLine(clues[i], lines[i].tolist())
+        if line is None:
+            return None
+        solved[i] = line
+    return solved
@@ -0,0 +1,251 @@
+"""
+Filename: nonogram_parallel_solver.py
+Date Created: 10/18/2026
+
+Searches a single puzzle across a pool of processes. The top of the search tree is expanded breadth first, and each
+open branch becomes an independent subproblem for a worker to search with NonogramPropagationSolver. There are several
+subproblems per process so that workers that finish early pick up more of them. Once enough solutions are found, the
+remaining workers are cancelled:
+    python nonogram_parallel_solver.py puzzles/hard_maybe_unique.puz --limit 2
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from multiprocessing import Event, Pool
+
+import numpy as np
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_line_cache import sharedLineCache
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_puzzle_file import readPuzzleFile
+from nonogram_solver import NonogramSolver
+from nonogram_solver_stats import SolverStats
+
+
+def packState(board):
+    """
+    Packs the cells of a board into two integers, with bit row * width + col set for every filled or empty cell, so a
+    subproblem costs a few hundred bytes to send to a worker however large the board is
+    :param board: a NonogramBitBoard
+    :return: (filledBits, emptyBits)
+    """
+    filled = empty = 0
+    for row in range(board.height):
+        filled |= board.rowFilled[row] << (row * board.width)
+        empty |= board.rowEmpty[row] << (row * board.width)
+    return filled, empty
+
+
+def unpackState(rowClues, colClues, state):
+    """
+    :param state: (filledBits, emptyBits) from packState
+    :return: a NonogramBitBoard of the clues with the packed cells marked
+    """
+    board = NonogramBitBoard.initFromClues(rowClues, colClues)
+    for bits, status in zip(state, ("yes", "no")):
+        while bits:
+            low = bits & -bits
+            row, col = divmod(low.bit_length() - 1, board.width)
+            board.updateBoard(row, col, status)
+            bits ^= low
+    return board
+
+
+# Set in each worker process by initWorker
+workerClues = None
+workerCancelled = None
+workerLimit = 1
+workerProbing = False
+
+CHUNK_STEPS = 2000  # Steps a worker takes between checks for cancellation
+
+
+def initWorker(rowClues, colClues, cancelled, limit, probing):
+    global workerClues, workerCancelled, workerLimit, workerProbing
+    workerClues = (rowClues, colClues)
+    workerCancelled = cancelled
+    workerLimit = limit
+    workerProbing = probing
+
+
+def searchSubproblem(state):
+    """
+    Searches one subproblem for solutions. This runs in the worker processes.
+    :param state: packed board of the subproblem, from packState
+    :return: (solutions, steps, backtracks, guesses), with each solution packed by np.packbits, or None if the search
+    was cancelled
+    """
+    if workerCancelled.is_set():
+        return None
+    board = unpackState(workerClues[0], workerClues[1], state)
+    solver = NonogramPropagationSolver(board, lineCache=sharedLineCache, probing=workerProbing)
+    solver.verbose = False
+    solver.start(workerLimit)
+    while not solver.resume(maxSteps=CHUNK_STEPS):
+        if workerCancelled.is_set():
+            return None
+    solutions = [np.packbits(solution).tobytes() for solution in solver.solutions]
+    return solutions, solver.numSteps, solver.numBacktracks, solver.numGuesses
+
+
+class NonogramParallelSolver(NonogramSolver):
+    """
+    Solves a board by splitting its search across a pool of processes. Any cells already marked on the board are kept.
+    For puzzles that propagation solves with little guessing, starting the pool costs more than it saves, so use this
+    for hard puzzles, or for counting the solutions of puzzles that have many.
+    """
+    def __init__(self, nonogram_board, processes=None, tasksPerProcess=8, probing=False):
+        """
+        :param nonogram_board: the board to solve
+        :param processes: number of worker processes (None for the number of cores)
+        :param tasksPerProcess: subproblems to split the search into per process, so the load stays balanced
+        :param probing: probe the unknown cells before guessing, in the split and in the workers
+        """
+        NonogramSolver.__init__(self, nonogram_board)
+        self.processes = processes if processes is not None else os.cpu_count()
+        self.tasksPerProcess = tasksPerProcess
+        self.probing = probing
+        self.solutions = []
+        self.numGuesses = 0
+        self.numTasks = 0
+        self.splitTime = 0.0  # Part of totalTime spent splitting the search
+
+    def solvePuzzle(self):
+        self.countSolutions(limit=1)
+        solved = len(self.solutions) > 0
+        if solved:
+            self.writeSolution(self.solutions[0])
+        if self.verbose:
+            if solved:
+                print("Puzzle Solved! It took " + str(self.numSteps) + " steps.")
+            else:
+                print("Puzzle has no solution. Gave up after " + str(self.numSteps) + " steps.")
+        return solved
+
+    def countSolutions(self, limit=2):
+        """
+        Counts the solutions of the board, stopping as soon as limit solutions have been found. The board is left as
+        it was before the call.
+        :param limit: the most solutions to look for
+        :return: (numSolutions, solutions), where solutions is a list of numSolutions boolean arrays (True for filled)
+        """
+        startTime = time.perf_counter()
+        self.numSteps = 0
+        self.numBacktracks = 0
+        self.numGuesses = 0
+        self.solutions = []
+
+        tasks = self.split(limit)
+        self.splitTime = time.perf_counter() - startTime
+        self.numTasks = len(tasks)
+        if tasks and len(self.solutions) < limit:
+            self.searchTasks(tasks, limit)
+        self.totalTime = time.perf_counter() - startTime
+        return len(self.solutions), self.solutions
+
+    def split(self, limit):
+        """
+        Expands the search tree breadth first, propagating every node, until there are enough open branches to keep
+        the pool busy. Solutions reached on the way are added to self.solutions.
+        :return: packed states of the open branches
+        """
+        root = NonogramBitBoard.initFromClues(self.board.rowClues, self.board.colClues)
+        for row in range(self.board.height):
+            for col in range(self.board.width):
+                root.setCell(row, col, self.board.getCell(row, col))
+        frontier = deque([root])
+        numTasks = self.processes * self.tasksPerProcess
+        while frontier and len(frontier) < numTasks and len(self.solutions) < limit:
+            board = frontier.popleft()
+            solver = NonogramPropagationSolver(board, lineCache=sharedLineCache, probing=self.probing)
+            solver.verbose = False
+            solver.start()
+            consistent = solver.propagate()
+            while consistent and self.probing:
+                solver.probe()
+                if not solver.queue:
+                    break
+                consistent = solver.propagate()
+            self.numSteps += solver.numSteps
+            if not consistent:
+                continue
+            row, col = solver.getBranchCell()
+            if row is None:
+                self.solutions.append(solver.getSolution())
+                continue
+            self.numGuesses += 1
+            for status in NonogramPropagationSolver.BRANCH_VALUES:
+                child = board.copy()
+                child.updateBoard(row, col, status)
+                frontier.append(child)
+        return [packState(board) for board in frontier]
+
+    def searchTasks(self, tasks, limit):
+        """
+        Searches the subproblems in the pool, and cancels the rest of them once limit solutions have been found
+        """
+        cancelled = Event()
+        with Pool(processes=self.processes, initializer=initWorker,
+                  initargs=(self.board.rowClues, self.board.colClues, cancelled, limit, self.probing)) as pool:
+            for result in pool.imap_unordered(searchSubproblem, tasks):
+                if result is None:
+                    continue
+                solutions, steps, backtracks, guesses = result
+                self.numSteps += steps
+                self.numBacktracks += backtracks
+                self.numGuesses += guesses
+                for packed in solutions:
+                    bits = np.unpackbits(np.frombuffer(packed, dtype=np.uint8), count=self.board.height * self.board.width)
+                    self.solutions.append(bits.reshape(self.board.height, self.board.width).astype(bool))
+                if len(self.solutions) >= limit:
+                    del self.solutions[limit:]
+                    cancelled.set()
+                    break  # Leaving the pool terminates any worker still searching
+
+    def writeSolution(self, solution):
+        for row in range(self.board.height):
+            for col in range(self.board.width):
+                status = "yes" if solution[row, col] else "no"
+                self.board.updateBoard(row, col, status)
+                if self.callbackFunction is not None:
+                    self.callbackFunction(row, col, status)
+
+    def getStats(self):
+        """
+        :return: SolverStats of the last search, summed over the split and every worker that finished
+        """
+        return SolverStats(assignments=self.numSteps, backtracks=self.numBacktracks, guesses=self.numGuesses,
+                           solutions=len(self.solutions),
+                           phaseTimes={"split": self.splitTime, "search": self.totalTime - self.splitTime},
+                           totalTime=self.totalTime)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search one puzzle for solutions across a pool of processes.")
+    parser.add_argument("puzzle", help=".puz file to solve")
+    parser.add_argument("--limit", type=int, default=2,
+                        help="stop once this many solutions are found (default: 2, enough to check uniqueness)")
+    parser.add_argument("-j", "--processes", type=int, default=os.cpu_count(),
+                        help="number of worker processes (default: number of cores)")
+    parser.add_argument("--tasks-per-process", type=int, default=8,
+                        help="subproblems to split the search into per process (default: 8)")
+    parser.add_argument("--probing", action="store_true", help="probe unknown cells before guessing")
+    args = parser.parse_args(argv)
+
+    rowClues, colClues = readPuzzleFile(args.puzzle)
+    solver = NonogramParallelSolver(NonogramBitBoard.initFromClues(rowClues, colClues), args.processes,
+                                    args.tasks_per_process, args.probing)
+    numSolutions, solutions = solver.countSolutions(args.limit)
+    for solution in solutions:
+        print("\n".join("".join("#" if filled else "." for filled in row) for row in solution) + "\n")
+    print(str(numSolutions) + " solution(s) found in " + "{:.2f}".format(solver.totalTime) + "s, split into " +
+          str(solver.numTasks) + " subproblems", file=sys.stderr)
+    print(solver.getStats(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
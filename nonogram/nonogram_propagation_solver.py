@@ -0,0 +1,431 @@
+"""
+Filename: nonogram_propagation_solver.py
+Date Created: 10/18/2026
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_branching import BRANCHING_STRATEGIES
+from nonogram_solver import NonogramSolver
+from nonogram_line_solver import normalizeClue, solveLine, solveLineMasks, UNKNOWN, YES, BOARD_NUMBER_TO_STATUS
+from nonogram_solver_stats import SolverStats
+
+
+DEFAULT_BRANCHING = "rowMajor"
+
+
+class NonogramPropagationSolver(NonogramSolver):
+    """
+    Solves a NonogramBoard by constraint propagation. Every row and column is line solved, and whenever a line fills
+    in a cell, the line crossing it is queued to be solved again. Only when propagation stalls does the solver guess
+    a cell, and it undoes the guess (and everything propagated from it) if the guess leads to a contradiction. With
+    probing on, a stall first tries both values of every unknown cell, which fixes most of the cells a guess would.
+
+    The search does not recurse. Guesses are kept on an explicit stack, and every assignment on a trail, so a search
+    can be started, run for a bounded number of steps or seconds, and resumed later from exactly where it stopped.
+    """
+    BRANCH_VALUES = ("yes", "no")  # Order in which the values of a guessed cell are tried
+
+    def __init__(self, nonogram_board, lineCache=None, branching=DEFAULT_BRANCHING, probing=False):
+        """
+        :param nonogram_board: the board to solve
+        :param lineCache: optional LineSolverCache to look up line solving results in, e.g. sharedLineCache. A
+        NonogramBitBoard is line solved on its bitmasks with solveLineMasks instead, which has its own cache.
+        :param branching: name of the BRANCHING_STRATEGIES entry that picks the cells to guess. This can be changed
+        between searches, and takes effect on the next call to start.
+        :param probing: probe the unknown cells whenever propagation stalls, before guessing (see probe)
+        """
+        NonogramSolver.__init__(self, nonogram_board)
+        self.lineCache = lineCache
+        self.lineSolver = solveLine if lineCache is None else lineCache.solve
+        self.branching = branching
+        self.brancher = None
+        self.probing = probing
+        self.packedLines = False  # True if the board is a NonogramBitBoard, whose lines are solved as bitmasks
+        self.rowBlocks = []  # Block lengths of each clue, as solveLineMasks takes them
+        self.colBlocks = []
+        self.probeCache = {}  # (row, col) of fruitless probes -> (row change counter, col change counter) at the time
+        self.numGuesses = 0
+        self.numProbes = 0
+        self.numProbeDeductions = 0  # Cells fixed by probing
+        self.maxDepth = 0  # Most guesses that were open at once
+        self.numLineSolves = 0
+        self.propagateTime = 0.0  # Part of totalTime spent in propagate
+        self.probeTime = 0.0  # Part of totalTime spent in probe
+        self.cacheStart = (0, 0)  # Hits and misses of the line cache when the search started
+        self.nextSample = 0  # Step count at which hooks.onSample is next called
+        self.trail = []  # (row, col) of every cell assigned by the solver, in order
+        self.decisions = []  # [row, col, trail length before the guess, index into BRANCH_VALUES] of every open guess
+        self.solutions = []
+        self.solutionLimit = 1  # The search finishes once it has found this many solutions
+        self.finished = True
+
+        # Unknown cells left in each line, and how many times each line has changed, for the branching strategy
+        self.rowUnknown = []
+        self.colUnknown = []
+        self.rowChanges = []
+        self.colChanges = []
+
+        # Lines waiting to be line solved. This persists between calls to resume so a search can pause mid-propagation.
+        self.queue = deque()
+        self.queuedRows = set()
+        self.queuedCols = set()
+
+        # Budget of the current call to resume
+        self.stepLimit = None
+        self.deadline = None
+
+    def reset(self):
+        self.numSteps = 0
+        self.numBacktracks = 0
+        self.numGuesses = 0
+        self.numProbes = 0
+        self.numProbeDeductions = 0
+        self.maxDepth = 0
+        self.numLineSolves = 0
+        self.propagateTime = 0.0
+        self.probeTime = 0.0
+        self.totalTime = 0.0
+        if self.lineCache is not None:
+            self.cacheStart = (self.lineCache.hits, self.lineCache.misses)
+        self.nextSample = 0 if self.hooks is None else self.hooks.sampleInterval
+        self.trail = []
+        self.decisions = []
+        self.solutions = []
+        self.probeCache = {}
+        self.clearQueue()
+
+    def solvePuzzle(self):
+        self.start()
+        self.resume()
+        solved = len(self.solutions) > 0
+        if self.verbose:
+            if solved:
+                print("Puzzle Solved! It took " + str(self.numSteps) + " steps.")
+            else:
+                print("Puzzle has no solution. Gave up after " + str(self.numSteps) + " steps.")
+        return solved
+
+    def countSolutions(self, limit=2):
+        """
+        Counts the solutions of the board, stopping as soon as limit solutions have been found. Every node of the search
+        is propagated before branching, so only branches consistent with every row and column are explored, and any
+        branch that propagation fills in completely costs no guesses. The board is left as it was before the call.
+        :param limit: the most solutions to look for. The default of 2 is enough to tell if a puzzle is unique, and
+        if it is not, the two solutions are a witness pair that differ in at least one cell.
+        :return: (numSolutions, solutions), where solutions is a list of numSolutions boolean arrays (True for filled)
+        """
+        self.start(limit)
+        self.resume()
+        self.undoTo(0)
+        return len(self.solutions), self.solutions
+
+    def start(self, limit=1):
+        """
+        Prepares a new search of the board. Nothing is assigned until resume is called.
+        :param limit: the search finishes once it has found this many solutions
+        """
+        self.reset()
+        self.solutionLimit = limit
+        self.finished = False
+        self.rowUnknown = [self.board.getRow(row).count(UNKNOWN) for row in range(self.board.height)]
+        self.colUnknown = [self.board.getCol(col).count(UNKNOWN) for col in range(self.board.width)]
+        self.rowChanges = [0] * self.board.height
+        self.colChanges = [0] * self.board.width
+        self.brancher = BRANCHING_STRATEGIES[self.branching](self)
+        self.packedLines = isinstance(self.board, NonogramBitBoard)
+        if self.packedLines:
+            self.rowBlocks = [tuple(normalizeClue(clue)) for clue in self.board.rowClues]
+            self.colBlocks = [tuple(normalizeClue(clue)) for clue in self.board.colClues]
+        for row in range(self.board.height):
+            self.queueLine(True, row)
+        for col in range(self.board.width):
+            self.queueLine(False, col)
+
+    def resume(self, maxSteps=None, maxTime=None):
+        """
+        Runs the search started by start, continuing from wherever the last call to resume stopped. When the search
+        finishes, the board holds the last solution found, or is back in its starting state if the search ran out of
+        solutions first.
+        :param maxSteps: pause once this many more cells have been assigned (None for no limit)
+        :param maxTime: pause once this many more seconds have passed (None for no limit)
+        :return: True if the search has finished, False if it paused because it used up its budget
+        """
+        startTime = time.perf_counter()
+        self.stepLimit = None if maxSteps is None else self.numSteps + maxSteps
+        self.deadline = None if maxTime is None else startTime + maxTime
+
+        try:
+            while not self.finished:
+                propagateStart = time.perf_counter()
+                consistent = self.propagate()
+                self.propagateTime += time.perf_counter() - propagateStart
+                if self.hooks is not None and self.numSteps >= self.nextSample:
+                    self.hooks.onSample(self)
+                    self.nextSample = self.numSteps + self.hooks.sampleInterval
+                if consistent is None:
+                    return False
+                if consistent and self.probing:
+                    probeStart = time.perf_counter()
+                    probed = self.probe()
+                    self.probeTime += time.perf_counter() - probeStart
+                    if probed is None:
+                        return False
+                    if self.queue:
+                        continue  # Probing fixed some cells, so propagate them before probing again
+                if consistent:
+                    row, col = self.getBranchCell()
+                    if row is not None:
+                        self.branch(row, col)
+                        continue
+                    self.solutions.append(self.getSolution())
+                    if self.hooks is not None:
+                        self.hooks.onSolution(self)
+                    if len(self.solutions) >= self.solutionLimit:
+                        self.finished = True
+                        break
+                self.backtrack()
+            return True
+        finally:
+            self.totalTime += time.perf_counter() - startTime
+
+    def getStats(self):
+        """
+        :return: SolverStats of the search so far. Time outside propagate is spent choosing guesses and backtracking.
+        """
+        cacheHits = cacheMisses = 0
+        if self.lineCache is not None:
+            cacheHits = self.lineCache.hits - self.cacheStart[0]
+            cacheMisses = self.lineCache.misses - self.cacheStart[1]
+        return SolverStats(assignments=self.numSteps, backtracks=self.numBacktracks, guesses=self.numGuesses,
+                           maxDepth=self.maxDepth, lineSolves=self.numLineSolves, solutions=len(self.solutions),
+                           cacheHits=cacheHits, cacheMisses=cacheMisses,
+                           phaseTimes={"propagate": self.propagateTime, "probe": self.probeTime,
+                                       "search": self.totalTime - self.propagateTime - self.probeTime},
+                           totalTime=self.totalTime)
+
+    def isOutOfBudget(self):
+        if self.stepLimit is not None and self.numSteps >= self.stepLimit:
+            return True
+        return self.deadline is not None and time.perf_counter() >= self.deadline
+
+    def branch(self, row, col):
+        """
+        Guesses the first value of an unknown cell, remembering the guess so that backtrack can revisit it
+        """
+        self.numGuesses += 1
+        self.decisions.append([row, col, len(self.trail), 0])
+        self.maxDepth = max(self.maxDepth, len(self.decisions))
+        self.assign(row, col, self.BRANCH_VALUES[0])
+        self.queueLine(True, row)
+        self.queueLine(False, col)
+        if self.hooks is not None:
+            self.hooks.onGuess(self, row, col)
+
+    def backtrack(self):
+        """
+        Undoes the most recent guess that still has a value left to try, along with everything assigned after it, and
+        tries that value instead. If no guess has a value left, the search is finished and the board is reset.
+        """
+        while self.decisions:
+            decision = self.decisions[-1]
+            row, col, mark, valueIdx = decision
+            self.undoTo(mark)
+            self.numBacktracks += 1
+            if self.hooks is not None:
+                self.hooks.onBacktrack(self)
+            if valueIdx + 1 < len(self.BRANCH_VALUES):
+                decision[3] = valueIdx + 1
+                self.assign(row, col, self.BRANCH_VALUES[valueIdx + 1])
+                self.queueLine(True, row)
+                self.queueLine(False, col)
+                return
+            self.decisions.pop()
+        self.undoTo(0)
+        self.finished = True
+
+    def queueLine(self, isRow, index):
+        if isRow:
+            if index not in self.queuedRows:
+                self.queue.append((True, index))
+                self.queuedRows.add(index)
+        elif index not in self.queuedCols:
+            self.queue.append((False, index))
+            self.queuedCols.add(index)
+
+    def clearQueue(self):
+        self.queue.clear()
+        self.queuedRows.clear()
+        self.queuedCols.clear()
+
+    def propagate(self, checkBudget=True):
+        """
+        Line solves the queued rows/columns, and keeps line solving any line that has a cell filled in, until no more
+        cells can be deduced.
+        :param checkBudget: stop early if the budget of the current resume runs out
+        :return: True if the queue was emptied, False if some line has no legal placement (the queue is then cleared),
+        or None if the budget of the current resume ran out first
+        """
+        while self.queue:
+            if checkBudget and self.isOutOfBudget():
+                return None
+            isRow, index = self.queue.popleft()
+            if isRow:
+                self.queuedRows.discard(index)
+            else:
+                self.queuedCols.discard(index)
+
+            changes = self.solvePackedLine(isRow, index) if self.packedLines else self.solveListLine(isRow, index)
+            self.numLineSolves += 1
+            if changes is None:
+                self.clearQueue()
+                return False
+
+            for i, status in changes:
+                if isRow:
+                    self.assign(index, i, status)
+                    self.queueLine(False, i)
+                else:
+                    self.assign(i, index, status)
+                    self.queueLine(True, i)
+        return True
+
+    def solveListLine(self, isRow, index):
+        """
+        Line solves one row/column of the board, without changing it
+        :return: list of (index in the line, status) of every cell the line solver deduced, or None if the line has no
+        legal placement
+        """
+        if isRow:
+            line = self.board.getRow(index)
+            solved = self.lineSolver(self.board.rowClues[index], line)
+        else:
+            line = self.board.getCol(index)
+            solved = self.lineSolver(self.board.colClues[index], line)
+        if solved is None:
+            return None
+        return [(i, BOARD_NUMBER_TO_STATUS[new]) for i, (old, new) in enumerate(zip(line, solved)) if old != new]
+
+    def solvePackedLine(self, isRow, index):
+        """
+        Does the same as solveListLine on a NonogramBitBoard, by line solving its masks directly (see solveLineMasks)
+        """
+        if isRow:
+            filled, empty = self.board.getRowMasks(index)
+            solved = solveLineMasks(self.rowBlocks[index], filled, empty, self.board.width)
+        else:
+            filled, empty = self.board.getColMasks(index)
+            solved = solveLineMasks(self.colBlocks[index], filled, empty, self.board.height)
+        if solved is None:
+            return None
+        newFilled, newEmpty = solved
+        deduced = (newFilled ^ filled) | (newEmpty ^ empty)
+        changes = []
+        while deduced:
+            bit = deduced & -deduced
+            deduced ^= bit
+            changes.append((bit.bit_length() - 1, "yes" if newFilled & bit else "no"))
+        return changes
+
+    def probe(self):
+        """
+        Tries each value of every unknown cell in turn, propagating it and undoing it again. If one value leads to a
+        contradiction, the cell must have the other value, and if that value fails too, propagating it finds out. If
+        neither does, any cell that both values fill in the same way is fixed to that value. Deductions are assigned and queued
+        for propagation, and probing stops at the first one so that it is propagated before the next probe.
+
+        A probe that deduces nothing is not repeated until a cell in its row or column changes.
+        :return: True once every probe is done or a deduction has been queued for propagation, or None if the budget
+        of the current resume ran out first
+        """
+        for row in range(self.board.height):
+            if self.rowUnknown[row] == 0:
+                continue
+            for col, number in enumerate(self.board.getRow(row)):
+                if number != UNKNOWN or self.probeCache.get((row, col)) == (self.rowChanges[row], self.colChanges[col]):
+                    continue
+                if self.isOutOfBudget():
+                    return None
+                yesCells = self.probeValue(row, col, "yes")
+                noCells = self.probeValue(row, col, "no") if yesCells is not None else None
+                if yesCells is None:
+                    deductions = {(row, col): "no"}  # Propagating this finds the contradiction if "no" fails too
+                elif noCells is None:
+                    deductions = {(row, col): "yes"}
+                else:
+                    deductions = {cell: status for cell, status in yesCells.items() if noCells.get(cell) == status}
+                if not deductions:
+                    self.probeCache[(row, col)] = (self.rowChanges[row], self.colChanges[col])
+                    continue
+                self.numProbeDeductions += len(deductions)
+                for (r, c), status in deductions.items():
+                    self.assign(r, c, status)
+                    self.queueLine(True, r)
+                    self.queueLine(False, c)
+                return True
+        return True
+
+    def probeValue(self, row, col, status):
+        """
+        Assigns a value to an unknown cell and propagates it, then undoes everything. The change counters of the lines
+        are restored too, since the board ends up exactly as it was.
+        :return: dict of (row, col) -> status of every cell the value filled in, or None if it led to a contradiction
+        """
+        self.numProbes += 1
+        mark = len(self.trail)
+        rowChanges = self.rowChanges[:]
+        colChanges = self.colChanges[:]
+        self.assign(row, col, status)
+        self.queueLine(True, row)
+        self.queueLine(False, col)
+        assigned = None
+        if self.propagate(checkBudget=False):
+            assigned = {(r, c): BOARD_NUMBER_TO_STATUS[self.board.getCell(r, c)] for r, c in self.trail[mark:]}
+        self.undoTo(mark)
+        self.rowChanges = rowChanges
+        self.colChanges = colChanges
+        return assigned
+
+    def getBranchCell(self):
+        """
+        Gets the row/col of the next cell to guess from the branching strategy
+        :return: (row, col) of the cell to guess, or (None, None) if the board is full
+        """
+        return self.brancher.getBranchCell()
+
+    def getSolution(self):
+        """
+        :return: boolean array of the filled cells of the (fully assigned) board
+        """
+        return np.array([[number == YES for number in self.board.getRow(row)] for row in range(self.board.height)],
+                        dtype=bool)
+
+    def assign(self, row, col, status):
+        self.numSteps += 1
+        self.board.updateBoard(row, col, status)
+        if self.callbackFunction is not None:
+            self.callbackFunction(row, col, status)
+        self.trail.append((row, col))
+        self.rowUnknown[row] -= 1
+        self.colUnknown[col] -= 1
+        self.rowChanges[row] += 1
+        self.colChanges[col] += 1
+
+    def undoTo(self, mark):
+        """
+        Resets every cell assigned since the trail had the given length back to unknown
+        :param mark: length of the trail to return to
+        """
+        while len(self.trail) > mark:
+            row, col = self.trail.pop()
+            self.board.updateBoard(row, col, "unknown")
+            if self.callbackFunction is not None:
+                self.callbackFunction(row, col, "unknown")
+            self.rowUnknown[row] += 1
+            self.colUnknown[col] += 1
+            self.rowChanges[row] += 1
+            self.colChanges[col] += 1
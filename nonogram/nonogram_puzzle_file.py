@@ -0,0 +1,234 @@
+"""
+Filename: nonogram_puzzle_file.py
+Date Created: 10/18/2026
+
+Reading and writing of .puz files. This module does not import tkinter, so batch tools can use it without a display.
+Puzzles can be streamed one at a time from a file, a directory, or stdin, and every puzzle is validated as it is read:
+    python nonogram_puzzle_file.py puzzles
+    cat a.puz b.puz | python nonogram_puzzle_file.py -
+"""
+
+import argparse
+import glob
+import os
+import sys
+
+PUZZLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "puzzles")
+
+
+class PuzzleFileError(ValueError):
+    """ Raised when a .puz file is malformed or describes an impossible puzzle """
+    def __init__(self, source, lineNumber, message):
+        """
+        :param source: name of the file (or stream) being read
+        :param lineNumber: 1-based line the error was found on, or None if it is not tied to a line
+        :param message: description of the error
+        """
+        location = source if lineNumber is None else source + ":" + str(lineNumber)
+        ValueError.__init__(self, location + ": " + message)
+        self.source = source
+        self.lineNumber = lineNumber
+
+
+def findPuzzleFiles(paths):
+    """
+    Expands directories and glob patterns into a list of .puz files
+    :param paths: list of .puz files, directories containing .puz files, or glob patterns
+    :return: sorted list of .puz file paths, without duplicates
+    """
+    puzzleFiles = set()
+    for path in paths:
+        if os.path.isdir(path):
+            puzzleFiles.update(glob.glob(os.path.join(path, "*.puz")))
+        else:
+            matches = glob.glob(path)
+            puzzleFiles.update(matches if matches else [path])  # Let a missing file be reported as an error
+    return sorted(puzzleFiles)
+
+
+def iterPuzzleFiles(paths):
+    """
+    Expands directories and glob patterns into .puz files lazily, so that huge directories are never listed in memory.
+    Unlike findPuzzleFiles, files are yielded in the order the file system lists them, and are not deduplicated.
+    :param paths: list of .puz files, directories containing .puz files, or glob patterns
+    :return: generator of .puz file paths
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".puz") and entry.is_file():
+                        yield entry.path
+        else:
+            matches = glob.iglob(path)
+            first = next(matches, None)
+            if first is None:
+                yield path  # Let a missing file be reported as an error
+            else:
+                yield first
+                yield from matches
+
+
+def checkLineFits(clue, length, source, lineNumber):
+    """
+    Checks that a clue's blocks, with a gap between each, fit in a line
+    :raises PuzzleFileError: if the clue has negative blocks or is too long for the line
+    """
+    if any(block < 0 for block in clue):
+        raise PuzzleFileError(source, lineNumber, "clue " + str(clue) + " has a negative block")
+    blocks = [block for block in clue if block > 0]
+    needed = sum(blocks) + max(len(blocks) - 1, 0)
+    if needed > length:
+        raise PuzzleFileError(source, lineNumber, "clue " + str(clue) + " needs " + str(needed) +
+                              " cells, but the line only has " + str(length))
+
+
+def iterPuzzles(lines, source="<stream>"):
+    """
+    Parses every puzzle in a stream of .puz text. Several puzzles can follow one another, optionally separated by blank
+    lines. Each puzzle is validated as it is read: every clue must fit in its line, and the rows and columns must fill
+    the same number of cells.
+    :param lines: iterable of lines, e.g. an open file
+    :param source: name to report errors against
+    :return: generator of (rowClues, colClues)
+    :raises PuzzleFileError: on the first malformed or impossible puzzle
+    """
+    numbered = enumerate(lines, 1)
+
+    def nextLine(expected):
+        for lineNumber, line in numbered:
+            return lineNumber, line.strip()
+        raise PuzzleFileError(source, None, "unexpected end of file, expected " + expected)
+
+    def readHeader(expected):
+        lineNumber, line = nextLine('"' + expected + '"')
+        if line.lower() != expected.lower():
+            raise PuzzleFileError(source, lineNumber, 'expected "' + expected + '", found "' + line + '"')
+        return lineNumber
+
+    def readCount(name):
+        lineNumber, line = nextLine("the number of " + name)
+        try:
+            count = int(line)
+        except ValueError:
+            raise PuzzleFileError(source, lineNumber, "expected the number of " + name + ', found "' + line + '"')
+        if count <= 0:
+            raise PuzzleFileError(source, lineNumber, "the number of " + name + " must be positive")
+        return count
+
+    def readClues(name, count, length):
+        clues = []
+        for i in range(count):
+            lineNumber, line = nextLine(str(count) + " " + name + " clues")
+            try:
+                clue = [int(a) for a in line.split()]
+            except ValueError:
+                raise PuzzleFileError(source, lineNumber, 'expected a ' + name + ' clue, found "' + line + '"')
+            checkLineFits(clue, length, source, lineNumber)
+            clues.append(clue)
+        return clues
+
+    for lineNumber, line in numbered:
+        line = line.strip()
+        if not line:
+            continue  # Blank lines between puzzles
+        if line.lower() != "rows:":
+            raise PuzzleFileError(source, lineNumber, 'expected "Rows:", found "' + line + '"')
+        startLine = lineNumber
+        numRows = readCount("rows")
+        readHeader("Cols:")
+        numCols = readCount("cols")
+        readHeader("Row clues:")
+        rowClues = readClues("row", numRows, numCols)
+        readHeader("Col clues:")
+        colClues = readClues("col", numCols, numRows)
+
+        rowTotal = sum(sum(clue) for clue in rowClues)
+        colTotal = sum(sum(clue) for clue in colClues)
+        if rowTotal != colTotal:
+            raise PuzzleFileError(source, startLine, "the row clues fill " + str(rowTotal) +
+                                  " cells, but the col clues fill " + str(colTotal))
+        yield rowClues, colClues
+
+
+def readPuzzleFile(path):
+    """
+    Reads the clues of a puzzle from a .puz file
+    :param path: path of the .puz file
+    :return: (rowClues, colClues)
+    :raises PuzzleFileError: if the file does not hold exactly one valid puzzle
+    """
+    with open(path, "r") as f:
+        puzzles = iterPuzzles(f, path)
+        puzzle = next(puzzles, None)
+        if puzzle is None:
+            raise PuzzleFileError(path, None, "no puzzle in file")
+        if next(puzzles, None) is not None:
+            raise PuzzleFileError(path, None, "more than one puzzle in file")
+    return puzzle
+
+
+def streamPuzzles(paths):
+    """
+    Streams every puzzle from a list of sources, reading one file at a time. A source can be a .puz file, a directory
+    of .puz files, a glob pattern, or "-" for stdin (which may hold several puzzles).
+    :param paths: list of sources
+    :return: generator of (name, rowClues, colClues), where name is the file name without .puz, or "<stdin>#n"
+    :raises PuzzleFileError: on the first invalid puzzle
+    """
+    for path in paths:
+        if path == "-":
+            for i, (rowClues, colClues) in enumerate(iterPuzzles(sys.stdin, "<stdin>")):
+                yield "<stdin>#" + str(i), rowClues, colClues
+            continue
+        for puzzleFile in iterPuzzleFiles([path]):
+            rowClues, colClues = readPuzzleFile(puzzleFile)
+            yield os.path.splitext(os.path.basename(puzzleFile))[0], rowClues, colClues
+
+
+def writePuzzleFile(path, rowClues, colClues):
+    """
+    Writes the clues of a puzzle to a .puz file
+    :param path: path of the .puz file
+    :param rowClues: row clues of the puzzle
+    :param colClues: col clues of the puzzle
+    """
+    with open(path, "w") as file:
+        file.write("Rows:\n")
+        file.write(str(len(rowClues)) + "\n")
+        file.write("Cols:\n")
+        file.write(str(len(colClues)) + "\n")
+        file.write("Row clues:\n")
+        for rowClue in rowClues:
+            for clue in rowClue:
+                file.write(str(clue) + " ")
+            file.write("\n")
+        file.write("Col clues:\n")
+        for colClue in colClues:
+            for clue in colClue:
+                file.write(str(clue) + " ")
+            file.write("\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate .puz files, reporting every invalid puzzle.")
+    parser.add_argument("paths", nargs="+", help='.puz files, directories, glob patterns, or "-" for stdin')
+    args = parser.parse_args(argv)
+
+    numValid = 0
+    numInvalid = 0
+    for path in args.paths:
+        sources = ["-"] if path == "-" else iterPuzzleFiles([path])
+        for source in sources:
+            try:
+                for puzzle in streamPuzzles([source]):
+                    numValid += 1
+            except (OSError, PuzzleFileError) as e:
+                print(e)
+                numInvalid += 1
+    print(str(numValid) + " valid, " + str(numInvalid) + " invalid")
+    return 1 if numInvalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
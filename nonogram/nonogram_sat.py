@@ -0,0 +1,406 @@
+"""
+Filename: nonogram_sat.py
+Date Created: 10/18/2026
+
+A CNF encoding of nonogram clues, and a small CDCL SAT engine to solve it with.
+
+Encoding: every cell has a variable, true if the cell is filled. Every block of every clue has one variable per position
+it could start at. Each line then gets clauses saying:
+    - each block starts at exactly one of its positions
+    - a block can only start at q if the block before it started at or before q - (length of the block before) - 1
+    - a starting block fills the cells it covers, and a filled cell is covered by some block that started
+Rows and columns share the cell variables, so a model of the clauses is a solution of the puzzle.
+
+The encoding of a .puz file can be exported in DIMACS format, to analyze with other SAT solvers:
+    python nonogram_sat.py puzzles/lion.puz lion.cnf
+"""
+
+import argparse
+import heapq
+import sys
+import time
+
+import numpy as np
+
+from nonogram_line_solver import normalizeClue
+from nonogram_puzzle_file import readPuzzleFile
+
+
+class NonogramCnf:
+    """ The clauses of a puzzle, in DIMACS style: variables are numbered from 1, and -v is the negation of v """
+    def __init__(self, rowClues, colClues):
+        self.height = len(rowClues)
+        self.width = len(colClues)
+        self.numVars = self.height * self.width  # The cell variables come first
+        self.clauses = []
+        for row in range(self.height):
+            self.encodeLine(rowClues[row], [self.cellVar(row, col) for col in range(self.width)])
+        for col in range(self.width):
+            self.encodeLine(colClues[col], [self.cellVar(row, col) for row in range(self.height)])
+
+    def cellVar(self, row, col):
+        return row * self.width + col + 1
+
+    def newVar(self):
+        self.numVars += 1
+        return self.numVars
+
+    def encodeLine(self, clue, cells):
+        """
+        Adds the clauses that make a line of cell variables match a clue
+        :param clue: row/col clue of the line
+        :param cells: variable of each cell of the line, in order
+        """
+        blocks = normalizeClue(clue)
+        length = len(cells)
+        if not blocks:
+            self.clauses.extend([-cell] for cell in cells)
+            return
+        slack = length - sum(blocks) - (len(blocks) - 1)
+        if slack < 0:
+            self.clauses.append([])  # The clue does not fit, so there is no solution
+            return
+
+        # starts[j] maps each position block j could start at to its variable
+        starts = []
+        earliest = 0
+        for block in blocks:
+            starts.append({position: self.newVar() for position in range(earliest, earliest + slack + 1)})
+            earliest += block + 1
+
+        covers = [[] for _ in range(length)]  # Start variables of the placements covering each cell
+        for j, block in enumerate(blocks):
+            self.clauses.append(list(starts[j].values()))
+            self.addAtMostOne(list(starts[j].values()))
+            for position, var in starts[j].items():
+                for i in range(position, position + block):
+                    self.clauses.append([-var, cells[i]])
+                    covers[i].append(var)
+                if j > 0:
+                    latest = position - blocks[j - 1] - 1
+                    self.clauses.append([-var] + [before for p, before in starts[j - 1].items() if p <= latest])
+        for i, cell in enumerate(cells):
+            self.clauses.append([-cell] + covers[i])
+
+    def addAtMostOne(self, variables):
+        """
+        Adds clauses allowing at most one of the variables to be true, with a sequential counter, which takes a linear
+        number of clauses rather than a clause for every pair
+        """
+        if len(variables) < 2:
+            return
+        prefix = [self.newVar() for _ in range(len(variables) - 1)]  # prefix[i] is true if any of variables[:i + 1] is
+        for i, var in enumerate(variables[:-1]):
+            self.clauses.append([-var, prefix[i]])
+            if i > 0:
+                self.clauses.append([-prefix[i - 1], prefix[i]])
+            self.clauses.append([-prefix[i], -variables[i + 1]])
+
+    def decode(self, model):
+        """
+        :param model: set of the variables that are true
+        :return: boolean array of the filled cells
+        """
+        cells = [var in model for var in range(1, self.height * self.width + 1)]
+        return np.array(cells, dtype=bool).reshape(self.height, self.width)
+
+    def blockingClause(self, solution):
+        """
+        :param solution: boolean array of the filled cells of a solution
+        :return: a clause that rules out that solution, to look for another one
+        """
+        return [-self.cellVar(row, col) if filled else self.cellVar(row, col)
+                for (row, col), filled in np.ndenumerate(solution)]
+
+    def writeDimacs(self, file):
+        """
+        Writes the clauses in DIMACS CNF format, for offline analysis with other SAT solvers. Variable
+        row * width + col + 1 is the cell at (row, col).
+        :param file: open text file to write to
+        """
+        file.write("c nonogram " + str(self.height) + "x" + str(self.width) + ", cell (row, col) is variable " +
+                   "row * " + str(self.width) + " + col + 1\n")
+        file.write("p cnf " + str(self.numVars) + " " + str(len(self.clauses)) + "\n")
+        for clause in self.clauses:
+            file.write(" ".join(str(literal) for literal in clause) + " 0\n")
+
+
+def lubySequence(i):
+    """
+    :return: the i-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..., used to space out restarts
+    """
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while True:
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+
+
+class CdclSolver:
+    """
+    A conflict-driven clause learning SAT solver: unit propagation with two watched literals, first-UIP clause
+    learning with non-chronological backjumping, VSIDS variable activity, phase saving and Luby restarts.
+    A call to solve can be given a budget, and a later call continues the same search where it stopped.
+    """
+    RESTART_BASE = 100  # Conflicts in the first restart interval
+    ACTIVITY_DECAY = 0.95
+
+    def __init__(self, numVars, clauses=()):
+        """
+        :param numVars: number of variables, numbered from 1
+        :param clauses: lists of non-zero literals
+        """
+        self.numVars = numVars
+        # Values and watches are indexed by literal. Python's negative indices put -v at the end of the list, so a list
+        # of 2 * numVars + 1 entries has a distinct slot for every literal, with no offset to compute.
+        self.values = [0] * (2 * numVars + 1)  # 1 true, -1 false, 0 unassigned
+        self.levels = [0] * (numVars + 1)
+        self.reasons = [None] * (numVars + 1)  # Clause that implied each assigned variable, None for decisions
+        self.trail = []
+        self.trailLimits = []  # Length of the trail when each decision level started
+        self.queueHead = 0  # Trail index of the next assignment to propagate
+        self.watches = [[] for _ in range(2 * numVars + 1)]  # Clauses watching each literal
+        self.activity = [0.0] * (numVars + 1)
+        self.activityIncrement = 1.0
+        self.phases = [False] * (numVars + 1)  # Last value of each variable, tried first when it is decided
+        # Heap of (-activity, var) to pick decisions from. A variable can have stale entries from before its activity
+        # was bumped, which are skipped. inOrder[var] is True while the heap has an entry with its current activity.
+        self.order = [(0.0, var) for var in range(1, numVars + 1)]
+        self.inOrder = [True] * (numVars + 1)
+        self.ok = True  # False once the clauses are known to be unsatisfiable
+        self.model = None
+
+        self.numConflicts = 0
+        self.numDecisions = 0
+        self.numPropagations = 0
+        self.numLearnts = 0
+        self.numRestarts = 0
+        self.conflictsUntilRestart = self.RESTART_BASE
+
+        for clause in clauses:
+            self.addClause(clause)
+
+    def addClause(self, clause):
+        """
+        Adds a clause. This can be done between calls to solve, e.g. to block a solution that was found.
+        :param clause: list of non-zero literals
+        """
+        if not self.ok:
+            return
+        self.backtrack(0)
+        literals = []
+        for literal in clause:
+            if -literal in literals or self.values[literal] == 1:
+                return  # Always satisfied
+            if literal not in literals and self.values[literal] == 0:
+                literals.append(literal)
+        if not literals:
+            self.ok = False
+        elif len(literals) == 1:
+            self.enqueue(literals[0], None)
+            if self.propagate() is not None:
+                self.ok = False
+        else:
+            self.watches[literals[0]].append(literals)
+            self.watches[literals[1]].append(literals)
+
+    def enqueue(self, literal, reason):
+        var = abs(literal)
+        self.values[literal] = 1
+        self.values[-literal] = -1
+        self.levels[var] = len(self.trailLimits)
+        self.reasons[var] = reason
+        self.trail.append(literal)
+        self.numPropagations += 1
+
+    def propagate(self):
+        """
+        Propagates every assignment on the trail that has not been propagated yet
+        :return: a clause with every literal false, or None if there is no conflict
+        """
+        values = self.values
+        while self.queueHead < len(self.trail):
+            falseLiteral = -self.trail[self.queueHead]
+            self.queueHead += 1
+            watchers = self.watches[falseLiteral]
+            kept = []
+            for k, clause in enumerate(watchers):
+                if clause[0] == falseLiteral:  # Keep the false watch in position 1
+                    clause[0], clause[1] = clause[1], falseLiteral
+                first = clause[0]
+                firstValue = values[first]
+                if firstValue == 1:
+                    kept.append(clause)
+                    continue
+                for m in range(2, len(clause)):
+                    literal = clause[m]
+                    if values[literal] != -1:
+                        clause[1], clause[m] = literal, falseLiteral
+                        self.watches[literal].append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if firstValue == -1:
+                        kept.extend(watchers[k + 1:])
+                        self.watches[falseLiteral] = kept
+                        self.queueHead = len(self.trail)
+                        return clause
+                    self.enqueue(first, clause)
+            self.watches[falseLiteral] = kept
+        return None
+
+    def analyze(self, conflict):
+        """
+        Finds the first-UIP clause learned from a conflict
+        :return: (learnt clause with the asserting literal first, decision level to backjump to)
+        """
+        level = len(self.trailLimits)
+        seen = set()
+        learnt = [0]
+        pending = 0  # Literals of the current level still to be resolved away
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for other in (clause if literal is None else clause[1:]):
+                var = abs(other)
+                if var not in seen and self.levels[var] > 0:
+                    seen.add(var)
+                    self.bumpActivity(var)
+                    if self.levels[var] >= level:
+                        pending += 1
+                    else:
+                        learnt.append(other)
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            clause = self.reasons[abs(literal)]
+            seen.discard(abs(literal))
+            pending -= 1
+            if pending == 0:
+                break
+        learnt[0] = -literal
+
+        backjumpLevel = 0
+        if len(learnt) > 1:
+            highest = max(range(1, len(learnt)), key=lambda i: self.levels[abs(learnt[i])])
+            learnt[1], learnt[highest] = learnt[highest], learnt[1]
+            backjumpLevel = self.levels[abs(learnt[1])]
+        return learnt, backjumpLevel
+
+    def bumpActivity(self, var):
+        self.activity[var] += self.activityIncrement
+        if self.activity[var] > 1e100:  # Rescale everything before it overflows
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.activityIncrement *= 1e-100
+            self.order = [(-self.activity[v], v) for v in range(1, self.numVars + 1) if self.inOrder[v]]
+            heapq.heapify(self.order)
+        elif self.inOrder[var]:
+            heapq.heappush(self.order, (-self.activity[var], var))
+
+    def backtrack(self, level):
+        """ Unassigns every variable assigned above the given decision level """
+        if len(self.trailLimits) <= level:
+            return
+        for literal in self.trail[self.trailLimits[level]:]:
+            var = abs(literal)
+            self.phases[var] = literal > 0
+            self.values[var] = 0
+            self.values[-var] = 0
+            self.reasons[var] = None
+            if not self.inOrder[var]:
+                self.inOrder[var] = True
+                heapq.heappush(self.order, (-self.activity[var], var))
+        del self.trail[self.trailLimits[level]:]
+        del self.trailLimits[level:]
+        self.queueHead = len(self.trail)
+
+    def pickBranchVariable(self):
+        """
+        :return: the unassigned variable with the highest activity, or None if every variable is assigned
+        """
+        while self.order:
+            negActivity, var = heapq.heappop(self.order)
+            if -negActivity != self.activity[var]:
+                continue  # Stale, the variable has a newer entry
+            self.inOrder[var] = False  # Assigned variables go back in the heap when they are unassigned
+            if self.values[var] == 0:
+                return var
+        return None
+
+    def solve(self, maxConflicts=None, maxPropagations=None, deadline=None):
+        """
+        Searches for a model of the clauses
+        :param maxConflicts: pause after this many more conflicts (None for no limit)
+        :param maxPropagations: pause after about this many more assignments (None for no limit)
+        :param deadline: pause once time.perf_counter() passes this (None for no limit)
+        :return: True if a model was found (it is then in self.model, as the set of true variables), False if the
+        clauses are unsatisfiable, or None if the budget ran out first. Calling solve again after None continues.
+        """
+        if not self.ok:
+            return False
+        conflictLimit = None if maxConflicts is None else self.numConflicts + maxConflicts
+        propagationLimit = None if maxPropagations is None else self.numPropagations + maxPropagations
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                self.numConflicts += 1
+                self.conflictsUntilRestart -= 1
+                if not self.trailLimits:
+                    self.ok = False
+                    return False
+                learnt, backjumpLevel = self.analyze(conflict)
+                self.backtrack(backjumpLevel)
+                if len(learnt) == 1:
+                    self.enqueue(learnt[0], None)
+                else:
+                    self.watches[learnt[0]].append(learnt)
+                    self.watches[learnt[1]].append(learnt)
+                    self.enqueue(learnt[0], learnt)
+                self.numLearnts += 1
+                self.activityIncrement /= self.ACTIVITY_DECAY
+                continue
+
+            if self.conflictsUntilRestart <= 0:
+                self.numRestarts += 1
+                self.conflictsUntilRestart = self.RESTART_BASE * lubySequence(self.numRestarts + 1)
+                self.backtrack(0)
+            if conflictLimit is not None and self.numConflicts >= conflictLimit:
+                return None
+            if propagationLimit is not None and self.numPropagations >= propagationLimit:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+
+            var = self.pickBranchVariable()
+            if var is None:
+                self.model = {var for var in range(1, self.numVars + 1) if self.values[var] == 1}
+                return True
+            self.numDecisions += 1
+            self.trailLimits.append(len(self.trail))
+            self.enqueue(var if self.phases[var] else -var, None)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write the CNF encoding of a .puz file in DIMACS format.")
+    parser.add_argument("puzzle", help=".puz file to encode")
+    parser.add_argument("output", nargs="?", help="DIMACS file to write (default: standard output)")
+    args = parser.parse_args(argv)
+
+    rowClues, colClues = readPuzzleFile(args.puzzle)
+    cnf = NonogramCnf(rowClues, colClues)
+    if args.output is None:
+        cnf.writeDimacs(sys.stdout)
+    else:
+        with open(args.output, "w") as file:
+            cnf.writeDimacs(file)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+"""
+Filename: nonogram_sat_solver.py
+Date Created: 10/18/2026
+"""
+
+import time
+
+from nonogram_sat import NonogramCnf, CdclSolver
+from nonogram_solver import NonogramSolver
+from nonogram_line_solver import solveLine, UNKNOWN, YES
+from nonogram_solver_stats import SolverStats
+
+try:
+    from pysat.solvers import Solver as PysatSolver
+except ImportError:
+    PysatSolver = None
+
+
+class PysatEngine:
+    """
+    Wraps a solver from the python-sat package in the interface of CdclSolver, so it can be used in its place when the
+    package is installed
+    """
+    def __init__(self, numVars, clauses, name="cadical153"):
+        self.solver = PysatSolver(name=name, bootstrap_with=clauses)
+        self.model = None
+        self.numConflicts = 0
+        self.numDecisions = 0
+        self.numPropagations = 0
+
+    def addClause(self, clause):
+        self.solver.add_clause(clause)
+
+    def solve(self, maxConflicts=None, maxPropagations=None, deadline=None):
+        """
+        Same as CdclSolver.solve. The deadline is not supported, so each call runs until its other budgets are used up.
+        """
+        if maxConflicts is not None:
+            self.solver.conf_budget(maxConflicts)
+        if maxPropagations is not None:
+            self.solver.prop_budget(maxPropagations)
+        result = self.solver.solve_limited()
+        stats = self.solver.accum_stats()
+        self.numConflicts = stats.get("conflicts", 0)
+        self.numDecisions = stats.get("decisions", 0)
+        self.numPropagations = stats.get("propagations", 0)
+        if result:
+            self.model = {literal for literal in self.solver.get_model() if literal > 0}
+        return result
+
+
+class NonogramSatSolver(NonogramSolver):
+    """
+    Solves a NonogramBoard by encoding its clues as CNF (see NonogramCnf) and handing the clauses to a SAT solver. The
+    bundled CdclSolver is used, or a python-sat solver if that package is installed. Clause learning lets this solver
+    finish puzzles that need deep guessing much faster than the propagation solver, which only ever backtracks one guess
+    at a time.
+
+    Like NonogramPropagationSolver, a search is started with start and run in bounded chunks with resume. The board is
+    only written to once a solution is found. A step is one assignment made by the SAT solver, and a backtrack is one
+    conflict.
+    """
+    def __init__(self, nonogram_board, useExternal=True):
+        """
+        :param nonogram_board: the board to solve
+        :param useExternal: use a python-sat solver if that package is installed, rather than the bundled one
+        """
+        NonogramSolver.__init__(self, nonogram_board)
+        self.useExternal = useExternal
+        self.cnf = None
+        self.engine = None
+        self.trail = []  # (row, col) of every cell the solver wrote to the board
+        self.solutions = []
+        self.solutionLimit = 1  # The search finishes once it has found this many solutions
+        self.finished = True
+        self.encodeTime = 0.0  # Part of totalTime spent building the clauses
+
+    def createEngine(self, numVars, clauses):
+        if self.useExternal and PysatSolver is not None:
+            return PysatEngine(numVars, clauses)
+        return CdclSolver(numVars, clauses)
+
+    def solvePuzzle(self):
+        self.start()
+        self.resume()
+        solved = len(self.solutions) > 0
+        if self.verbose:
+            if solved:
+                print("Puzzle Solved! It took " + str(self.numSteps) + " steps.")
+            else:
+                print("Puzzle has no solution. Gave up after " + str(self.numSteps) + " steps.")
+        return solved
+
+    def countSolutions(self, limit=2):
+        """
+        Counts the solutions of the board, stopping as soon as limit solutions have been found. Each solution found is
+        ruled out with a clause over the cell variables, and the search continues with everything it has learned.
+        The board is left as it was before the call.
+        :param limit: the most solutions to look for
+        :return: (numSolutions, solutions), where solutions is a list of numSolutions boolean arrays (True for filled)
+        """
+        self.start(limit)
+        self.resume()
+        self.undoTo(0)
+        return len(self.solutions), self.solutions
+
+    def start(self, limit=1):
+        """
+        Encodes the board, including any cells already marked on it. Nothing is searched until resume is called.
+        :param limit: the search finishes once it has found this many solutions
+        """
+        startTime = time.perf_counter()
+        self.trail = []  # The board may have been replaced or reset since the last search, so it is not written to
+        self.numSteps = 0
+        self.numBacktracks = 0
+        self.totalTime = 0.0
+        self.solutions = []
+        self.solutionLimit = limit
+        self.finished = False
+
+        self.cnf = NonogramCnf(self.board.rowClues, self.board.colClues)
+        grid = self.lineSolveGrid()
+        if grid is None:
+            self.cnf.clauses.append([])
+        else:
+            for row in range(self.board.height):
+                for col, number in enumerate(grid[row]):
+                    if number != UNKNOWN:
+                        var = self.cnf.cellVar(row, col)
+                        self.cnf.clauses.append([var if number == YES else -var])
+        self.engine = self.createEngine(self.cnf.numVars, self.cnf.clauses)
+        self.encodeTime = time.perf_counter() - startTime
+        self.totalTime = self.encodeTime
+
+    def lineSolveGrid(self):
+        """
+        Line solves every row and column of a copy of the board until nothing more can be deduced. Unit propagation on
+        the clauses sees less than the line solver does, so the cells it deduces are given to the SAT solver up front.
+        :return: list of rows of board numbers, or None if some line has no legal placement
+        """
+        grid = [list(self.board.getRow(row)) for row in range(self.board.height)]
+        rowQueue = set(range(self.board.height))
+        colQueue = set(range(self.board.width))
+        while rowQueue or colQueue:
+            for row in rowQueue:
+                solved = solveLine(self.board.rowClues[row], grid[row])
+                if solved is None:
+                    return None
+                for col, number in enumerate(solved):
+                    if number != grid[row][col]:
+                        grid[row][col] = number
+                        colQueue.add(col)
+            rowQueue = set()
+            for col in colQueue:
+                solved = solveLine(self.board.colClues[col], [grid[row][col] for row in range(self.board.height)])
+                if solved is None:
+                    return None
+                for row, number in enumerate(solved):
+                    if number != grid[row][col]:
+                        grid[row][col] = number
+                        rowQueue.add(row)
+            colQueue = set()
+        return grid
+
+    def resume(self, maxSteps=None, maxTime=None):
+        """
+        Runs the search started by start, continuing from wherever the last call to resume stopped. When the search
+        finishes, the board holds the last solution found, or is back in its starting state if there was none.
+        :param maxSteps: pause once about this many more assignments have been made (None for no limit)
+        :param maxTime: pause once this many more seconds have passed (None for no limit)
+        :return: True if the search has finished, False if it paused because it used up its budget
+        """
+        startTime = time.perf_counter()
+        stepLimit = None if maxSteps is None else self.engine.numPropagations + maxSteps
+        deadline = None if maxTime is None else startTime + maxTime
+        try:
+            while not self.finished:
+                maxPropagations = None if stepLimit is None else max(stepLimit - self.engine.numPropagations, 1)
+                result = self.engine.solve(maxPropagations=maxPropagations, deadline=deadline)
+                self.numSteps = self.engine.numPropagations
+                self.numBacktracks = self.engine.numConflicts
+                if result is None:
+                    return False
+                if not result:
+                    self.finished = True
+                    break
+                solution = self.cnf.decode(self.engine.model)
+                self.solutions.append(solution)
+                self.writeSolution(solution)
+                if self.hooks is not None:
+                    self.hooks.onSolution(self)
+                if len(self.solutions) >= self.solutionLimit:
+                    self.finished = True
+                    break
+                self.engine.addClause(self.cnf.blockingClause(solution))
+            return True
+        finally:
+            self.totalTime += time.perf_counter() - startTime
+
+    def writeSolution(self, solution):
+        """ Marks a solution on the board, over any solution written before it """
+        self.undoTo(0)
+        for row in range(self.board.height):
+            for col, number in enumerate(self.board.getRow(row)):
+                if number == UNKNOWN:
+                    status = "yes" if solution[row, col] else "no"
+                    self.board.updateBoard(row, col, status)
+                    if self.callbackFunction is not None:
+                        self.callbackFunction(row, col, status)
+                    self.trail.append((row, col))
+
+    def undoTo(self, mark):
+        """
+        Resets every cell written since the trail had the given length back to unknown
+        :param mark: length of the trail to return to
+        """
+        while len(self.trail) > mark:
+            row, col = self.trail.pop()
+            self.board.updateBoard(row, col, "unknown")
+            if self.callbackFunction is not None:
+                self.callbackFunction(row, col, "unknown")
+
+    def getStats(self):
+        """
+        :return: SolverStats of the search so far. Guesses are the SAT solver's decisions.
+        """
+        guesses = 0 if self.engine is None else self.engine.numDecisions
+        return SolverStats(assignments=self.numSteps, backtracks=self.numBacktracks, guesses=guesses,
+                           solutions=len(self.solutions),
+                           phaseTimes={"encode": self.encodeTime, "search": self.totalTime - self.encodeTime},
+                           totalTime=self.totalTime)
+
+    def writeDimacs(self, path):
+        """
+        Writes the CNF encoding of the board, including any cells already marked on it, to a DIMACS file
+        :param path: path of the file to write
+        """
+        if self.cnf is None:
+            self.start()
+        with open(path, "w") as file:
+            self.cnf.writeDimacs(file)
@@ -3,16 +3,81 @@ Filename: nonogram_solver.py
 Date Created: 5/4/2021
 """
 
-from utils import emptyCallback
+import time
+from collections import deque
+
+from nonogram_line_solver import normalizeClue, NO, YES
+from nonogram_solver_stats import SolverStats
+
+
+class LineVerifier:
+    """
+    Tracks whether the cells assigned so far to one row/col can still be completed into a line matching its clue.
+    Cells must be assigned in order, from the start of the line, which is the order NonogramSolver fills the board in.
+    Each assignment is checked in O(1) against the clue index and the length of the run in progress, and the previous
+    state is saved so that it can be undone in O(1) on backtrack.
+    """
+    def __init__(self, clue, length):
+        self.blocks = normalizeClue(clue)
+        self.length = length
+
+        # minRemaining[j] is the fewest cells that blocks[j:] can be placed in (blocks plus the gaps between them)
+        self.minRemaining = [0] * (len(self.blocks) + 1)
+        for j in range(len(self.blocks) - 1, -1, -1):
+            gap = 1 if j < len(self.blocks) - 1 else 0
+            self.minRemaining[j] = self.blocks[j] + gap + self.minRemaining[j + 1]
+
+        self.position = 0  # Number of cells assigned so far
+        self.clueIdx = 0  # Index of the block currently being filled (or the next block, if runLength is 0)
+        self.runLength = 0  # Length of the run of yeses ending at the last assigned cell
+        self.history = []
+
+    def push(self, number):
+        """
+        Assigns the next cell of the line. The assignment is recorded even if it is invalid, so every push must be
+        matched with a pop.
+        :param number: board number of the cell (NO or YES)
+        :return: True if the line can still match its clue, False otherwise
+        """
+        self.history.append((self.clueIdx, self.runLength))
+        self.position += 1
+        tilesLeft = self.length - self.position
+
+        if number == YES:
+            if self.clueIdx >= len(self.blocks):  # Every block has already been placed
+                return False
+            self.runLength += 1
+            if self.runLength > self.blocks[self.clueIdx]:  # The current run is longer than its block
+                return False
+            return tilesLeft >= self.minRemaining[self.clueIdx] - self.runLength
+        else:
+            if self.runLength > 0:  # A run just ended, so it has to match its block exactly
+                if self.runLength != self.blocks[self.clueIdx]:
+                    return False
+                self.clueIdx += 1
+                self.runLength = 0
+            return tilesLeft >= self.minRemaining[self.clueIdx]
+
+    def pop(self):
+        """ Undoes the most recent push """
+        self.clueIdx, self.runLength = self.history.pop()
+        self.position -= 1
+
 
 class NonogramSolver:
+    maxNogoods = 100000  # Most nogoods solveTile remembers at once, 0 to turn off nogood learning
+
     def __init__(self, nonogram_board):
         self.board = nonogram_board
 
-        self.callbackFunction = emptyCallback
+        self.callbackFunction = None  # Called with every assignment, if configured
+        self.hooks = None  # SolverHooks to report search events to, if configured
 
         self.showSteps = True
+        self.verbose = True  # Print a summary when a solve finishes
         self.numSteps = 0
+        self.numBacktracks = 0
+        self.totalTime = 0.0
 
     def configureCallbackFunction(self, function):
         """
@@ -22,93 +87,178 @@ class NonogramSolver:
         """
         self.callbackFunction = function
 
+    def configureHooks(self, hooks):
+        """
+        Configures hooks to report search events to, e.g. to sample a long search as it runs
+        :param hooks: a SolverHooks, or None to stop reporting events
+        """
+        self.hooks = hooks
+
+    def getStats(self):
+        """
+        :return: SolverStats of the last solve
+        """
+        return SolverStats(assignments=self.numSteps, backtracks=self.numBacktracks,
+                           phaseTimes={"search": self.totalTime}, totalTime=self.totalTime)
+
     def solvePuzzle(self):
         self.numSteps = 0
-        self.solveTile(0, 0)
-        print("Puzzle Solved! It took " + str(self.numSteps) + " steps.")
+        self.numBacktracks = 0
+        # State of the backtracking search, which subclasses with their own search never create
+        self.rowVerifiers = [LineVerifier(clue, self.board.width) for clue in self.board.rowClues]
+        self.colVerifiers = [LineVerifier(clue, self.board.height) for clue in self.board.colClues]
+        startTime = time.perf_counter()
+        solved = self.solveTile(0, 0)
+        self.totalTime = time.perf_counter() - startTime
+        if self.verbose:
+            print("Puzzle Solved! It took " + str(self.numSteps) + " steps.")
+        return solved
 
     def solveTile(self, row, col):
+        """
+        Solves the board from the given cell onwards, trying "no" and then "yes" for each cell in getNextTile order.
+        The cells being tried are kept on an explicit stack rather than recursing once per cell, so the size of the
+        board is not limited by Python's recursion limit.
+
+        The search uses conflict-directed backjumping. Every cell on the stack keeps a conflict set: the earlier cells
+        whose values ruled out its values so far. When a row or column verifier rejects a value, the cells of that
+        line's prefix are the conflict. When both values of a cell fail, the search jumps straight back to the latest
+        cell in its conflict set, skipping cells that had nothing to do with the failure, and that cell inherits the
+        rest of the set. The values of the conflict set are also learned as a nogood, so the same dead end is
+        recognized as soon as it comes up again in another branch. Conflict sets are bitmasks of cell indexes
+        (row * width + col), so the latest cell of a set is its highest bit.
+        :param row: row of the first cell to solve
+        :param col: column of the first cell to solve
+        :return: True if the board was solved, False if no assignment of the remaining cells works
+        """
+        width = self.board.width
+        self.initNogoods()
+        colMasks = [sum(1 << (i * width + c) for i in range(self.board.height)) for c in range(width)]
+        yesBits = 0  # Bitmask of the cells currently assigned "yes"
+
+        stack = [[row, col, -1, 0]]  # [row, col, index into values of the value currently assigned, conflict set]
+        values = [(NO, "no"), (YES, "yes")]
         self.numSteps += 1
-        nextRow, nextCol = self.getNextTile(row, col)
-        noWorks = False
-        yesWorks = False
-
-        self.board.updateBoard(row, col, "no")
-        self.callbackFunction(row, col, "no")
-        if self.verifyCell(row,col):
-            if nextRow is None:
-                return True
-            else:
-                noWorks = self.solveTile(nextRow, nextCol)
-        if noWorks:
-            return True
-
-        self.board.updateBoard(row, col, "yes")
-        self.callbackFunction(row, col, "yes")
-        if self.verifyCell(row,col):
-            if nextRow is None:
-                return True
-            else:
-                yesWorks = self.solveTile(nextRow, nextCol)
+        while stack:
+            tile = stack[-1]
+            row, col, valueIdx, conflicts = tile
+            cell = row * width + col
+            if valueIdx >= 0:  # The value currently assigned did not work
+                self.popCell(row, col)
+                yesBits &= ~(1 << cell)
+                self.numBacktracks += 1
+                if self.hooks is not None:
+                    self.hooks.onBacktrack(self)
+
+            valueIdx += 1
+            if valueIdx == len(values):  # Neither value works, so jump back to the latest cell to blame
+                self.board.updateBoard(row, col, "unknown")
+                if self.callbackFunction is not None:
+                    self.callbackFunction(row, col, "unknown")
+                stack.pop()
+                if conflicts == 0:  # No earlier cell is to blame, so there is no solution
+                    return False
+                target = conflicts.bit_length() - 1
+                self.learnNogood(target, conflicts, yesBits & conflicts)
+                while stack and stack[-1][0] * width + stack[-1][1] > target:
+                    skipped = stack.pop()
+                    self.popCell(skipped[0], skipped[1])
+                    yesBits &= ~(1 << (skipped[0] * width + skipped[1]))
+                    self.board.updateBoard(skipped[0], skipped[1], "unknown")
+                    if self.callbackFunction is not None:
+                        self.callbackFunction(skipped[0], skipped[1], "unknown")
+                    self.numBacktracks += 1
+                if not stack:  # The cell to blame was assigned before this search started
+                    return False
+                stack[-1][3] |= conflicts & ~(1 << target)
+                continue
+            tile[2] = valueIdx
+
+            number, status = values[valueIdx]
+            self.board.updateBoard(row, col, status)
+            if self.callbackFunction is not None:
+                self.callbackFunction(row, col, status)
+            if number == YES:
+                yesBits |= 1 << cell
+
+            rowValid, colValid = self.pushCell(row, col, number)
+            if not rowValid:
+                tile[3] |= ((1 << col) - 1) << (row * width)  # The cells before this one in its row
+            if not colValid:
+                tile[3] |= colMasks[col] & ((1 << (row * width)) - 1)  # The cells above this one in its column
+            if rowValid and colValid:
+                nogood = self.matchNogood(cell, yesBits)
+                if nogood:
+                    tile[3] |= nogood & ~(1 << cell)
+                    continue
+                nextRow, nextCol = self.getNextTile(row, col)
+                if nextRow is None:
+                    if self.hooks is not None:
+                        self.hooks.onSolution(self)
+                    return True
+                self.numSteps += 1
+                stack.append([nextRow, nextCol, -1, 0])
+        return False
 
-        if noWorks and yesWorks:
-            print("INVALID PUZZLE, MULTIPLE SOLUTIONS") # TODO: Make this work somehow
-        if not (noWorks or yesWorks):
-            self.board.updateBoard(row, col, "unknown")
-            self.callbackFunction(row, col, "unknown")
+    def initNogoods(self):
+        """ Forgets every nogood learned by a previous search """
+        self.nogoods = {}  # Cell index -> {(conflict set, yes cells of the conflict set): None}, by the latest cell
+        self.nogoodOrder = deque()  # (cell index, nogood) in the order they were learned, to evict the oldest
+        self.numNogoodHits = 0
 
-        return noWorks or yesWorks
+    def learnNogood(self, cell, conflicts, yesBits):
+        """
+        Records that the cells of a conflict set cannot take their current values together. Once the store holds
+        maxNogoods nogoods, the oldest one is forgotten for each new one.
+        :param cell: index of the latest cell of the conflict set, which the nogood is checked on
+        :param conflicts: bitmask of the cells of the conflict set
+        :param yesBits: bitmask of the cells of the conflict set that are "yes"
+        """
+        if self.maxNogoods <= 0:
+            return
+        nogood = (conflicts, yesBits)
+        watched = self.nogoods.setdefault(cell, {})
+        if nogood in watched:
+            return
+        watched[nogood] = None
+        self.nogoodOrder.append((cell, nogood))
+        if len(self.nogoodOrder) > self.maxNogoods:
+            oldCell, oldNogood = self.nogoodOrder.popleft()
+            del self.nogoods[oldCell][oldNogood]
 
+    def matchNogood(self, cell, yesBits):
+        """
+        Checks the nogoods that end at a cell against the current assignment. Every other cell of such a nogood comes
+        earlier in the search order, so it is already assigned.
+        :param cell: index of the cell that was just assigned
+        :param yesBits: bitmask of the cells currently assigned "yes"
+        :return: the conflict set of a matching nogood, or 0 if none match
+        """
+        watched = self.nogoods.get(cell)
+        if watched:
+            for conflicts, nogoodYes in watched:
+                if yesBits & conflicts == nogoodYes:
+                    self.numNogoodHits += 1
+                    return conflicts
+        return 0
 
-    def verifyCell(self, row, col):
+    def pushCell(self, row, col, number):
         """
-        This function checks to see if a specific cell is viable. It does this by checking to see if the row and column
-        containing the cell are viable.
+        Records the assignment of a cell with the verifiers of its row and column. Cells have to be assigned in the
+        order given by getNextTile.
         :param row: row of the cell
         :param col: column of the cell
-        :return: True if viable, False otherwise
-        """
-        def verifyClue(clue, statuses):
-            clueSum = sum(clue)
-            clueIdx = 0
-            yesCount = 0
-            totalYes = 0
-            for i, status in enumerate(statuses):
-                if status == 0:  # If the current tile is Unknown, then check to see if we can get enough yeses
-                    tilesLeft = len(statuses) - i
-                    if clueSum > tilesLeft + totalYes:  # If we have too few yeses, the row/col is impossible
-                        return False
-                    # if we have enough yeses possible, just return True, this row/col is plausible
-                    return True
-                elif status == 1:  # If the current tile is No, then we check to see if the clue matches
-                    if yesCount > 0:  # only check if clue matches if we have a clue
-                        if yesCount == clue[clueIdx]:  # If we match, then we keep going
-                            clueIdx += 1
-                            yesCount = 0
-                        else:  # The clue did not match, terminate
-                            return False
-                elif status == 2:  # If the current tile is Yes, then we increment our current clue
-                    yesCount += 1
-                    totalYes += 1
-                    if totalYes > clueSum:  # If we have accumulated too many yeses, the row/col is invalid
-                        return False
-                    if yesCount > clue[clueIdx]:  # If we have exceeded the length of our current clue, the row/col is invalid
-                        return False
-
-            #  If we have exited the loop, then we are at the end of the row/col. We can only be valid if the row/col is
-            #  solved. Because we have been checking each clue as we go, this can be checked by verifying the total
-            #  yeses is the same as the row/col clue sum
-            if totalYes == clueSum:
-                return True
-            else:
-                return False
-
-        rowClue = self.board.rowClues[row]
-        colClue = self.board.colClues[col]
-        rowStatuses = [self.board.board[row, c] for c in range(self.board.width)]
-        colStatuses = [self.board.board[r, col] for r in range(self.board.height)]
-        return verifyClue(rowClue, rowStatuses) and verifyClue(colClue, colStatuses)
+        :param number: board number assigned to the cell
+        :return: (rowValid, colValid), whether the row and the column can still match their clues
+        """
+        rowValid = self.rowVerifiers[row].push(number)
+        colValid = self.colVerifiers[col].push(number)
+        return rowValid, colValid
 
+    def popCell(self, row, col):
+        """ Undoes the last pushCell, which must have been for this cell """
+        self.rowVerifiers[row].pop()
+        self.colVerifiers[col].pop()
 
     def getNextTile(self, row, col):
         """
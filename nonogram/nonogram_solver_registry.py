@@ -0,0 +1,48 @@
+"""
+Filename: nonogram_solver_registry.py
+Date Created: 10/18/2026
+"""
+
+from functools import partial
+
+from nonogram_solver import NonogramSolver
+from nonogram_line_cache import sharedLineCache
+from nonogram_parallel_solver import NonogramParallelSolver
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_sat_solver import NonogramSatSolver
+from nonogram_vectorized_solver import NonogramVectorizedSolver
+
+# Every solver strategy that tools can select by name. Each takes a board in its constructor and solves it in place
+# with solvePuzzle(), following the NonogramSolver interface.
+SOLVER_TYPES = {
+    "propagation": NonogramPropagationSolver,
+    "cached": partial(NonogramPropagationSolver, lineCache=sharedLineCache),
+    "mostConstrained": partial(NonogramPropagationSolver, branching="mostConstrainedLine"),
+    "fewestPlacements": partial(NonogramPropagationSolver, branching="fewestPlacements"),
+    "probing": partial(NonogramPropagationSolver, lineCache=sharedLineCache, probing=True),
+    "vectorized": NonogramVectorizedSolver,
+    "sat": NonogramSatSolver,
+    "parallel": NonogramParallelSolver,
+    "backtracking": NonogramSolver,
+}
+
+# Solvers that also support searching in bounded chunks with start/resume, and counting solutions with countSolutions,
+# as the GUI and the batch tools need
+SEARCH_SOLVERS = ["propagation", "cached", "mostConstrained", "fewestPlacements", "probing", "sat"]
+
+# Solvers whose step counts vary from run to run, because the work is split between processes that race each other
+NONDETERMINISTIC_SOLVERS = ["parallel"]
+
+DEFAULT_SOLVER = "propagation"
+
+
+def createSolver(name, board):
+    """
+    Creates a solver by name, configured to solve quietly
+    :param name: key of SOLVER_TYPES
+    :param board: the board to solve
+    :return: the solver
+    """
+    solver = SOLVER_TYPES[name](board)
+    solver.verbose = False
+    return solver
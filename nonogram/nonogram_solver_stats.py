@@ -0,0 +1,71 @@
+"""
+Filename: nonogram_solver_stats.py
+Date Created: 10/18/2026
+"""
+
+import json
+
+
+class SolverStats:
+    """
+    Summary of the work a solver did on one search, as returned by a solver's getStats(). Times are in seconds.
+    """
+    def __init__(self, assignments=0, backtracks=0, guesses=0, maxDepth=0, lineSolves=0, solutions=0,
+                 cacheHits=0, cacheMisses=0, phaseTimes=None, totalTime=0.0):
+        self.assignments = assignments  # Cells assigned, including ones later undone
+        self.backtracks = backtracks
+        self.guesses = guesses
+        self.maxDepth = maxDepth  # Most guesses that were open at once
+        self.lineSolves = lineSolves
+        self.solutions = solutions
+        self.cacheHits = cacheHits  # Line cache lookups during this search, if the solver has a cache
+        self.cacheMisses = cacheMisses
+        self.phaseTimes = phaseTimes if phaseTimes is not None else {}
+        self.totalTime = totalTime
+
+    def toDict(self):
+        """
+        :return: dict of every statistic, ready to be written as JSON
+        """
+        return {"assignments": self.assignments,
+                "backtracks": self.backtracks,
+                "guesses": self.guesses,
+                "maxDepth": self.maxDepth,
+                "lineSolves": self.lineSolves,
+                "solutions": self.solutions,
+                "cacheHits": self.cacheHits,
+                "cacheMisses": self.cacheMisses,
+                "phaseTimes": dict(self.phaseTimes),
+                "totalTime": self.totalTime}
+
+    def toJson(self, indent=None):
+        return json.dumps(self.toDict(), indent=indent)
+
+    def __str__(self):
+        return "Solver stats: " + ", ".join(key + "=" + str(value) for key, value in self.toDict().items())
+
+
+class SolverHooks:
+    """
+    Receives events from a running solver. Subclass this and override the events you want, then pass an instance to
+    the solver's configureHooks. A solver with no hooks configured skips every event without calling anything.
+    Only search events are reported, so hooks cost nothing per assignment; use configureCallbackFunction to see every
+    assignment.
+    """
+    sampleInterval = 10000  # onSample is called about once per this many assignments
+
+    def onGuess(self, solver, row, col):
+        """ Called after the solver guesses the value of an unknown cell """
+        pass
+
+    def onBacktrack(self, solver):
+        """ Called after the solver undoes a guess """
+        pass
+
+    def onSolution(self, solver):
+        """ Called when the solver finds a solution, while the board still holds it """
+        pass
+
+    def onSample(self, solver):
+        """ Called between propagations once sampleInterval assignments have passed since the last sample """
+        pass
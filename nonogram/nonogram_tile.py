@@ -2,13 +2,17 @@
 Filename: nonogram_tile.py
 Date Created: 5/4/2021
 """
-from utils import Tile
+from utils import Tile, CanvasTile
 
-class NonogramTile(Tile):
+class NonogramTileMixin:
+    """
+    The behaviour of a nonogram tile: it has a status of unknown/no/yes, shown by its color, which is cycled by left
+    (yes) and right (no) clicks. This is shared by the widget-based NonogramTile and the canvas-based
+    NonogramCanvasTile, and must be combined with Tile or CanvasTile.
+    """
     STATUS_TYPES = ["unknown", "no", "yes"]
 
-    def __init__(self, parent, row=0, col=0, colorUnknown="white", colorNo="gray75", colorYes="black", status="unknown"):
-        Tile.__init__(self, parent, row=row, col=col, color=colorUnknown)
+    def initStatus(self, colorUnknown, colorNo, colorYes, status):
         self.colors = {"unknown": colorUnknown,
                        "yes": colorYes,
                        "no": colorNo}
@@ -43,7 +47,7 @@ class NonogramTile(Tile):
         print("NonogramTile: Don't use setColor with this class. Use configureColor or setStatus.")
 
     def setStatus(self, status):
-        if status in NonogramTile.STATUS_TYPES:
+        if status in NonogramTileMixin.STATUS_TYPES:
             self.status = status
         else:
             print("NonogramTile: unknown status type")
@@ -53,4 +57,14 @@ class NonogramTile(Tile):
         self.refresh()
 
     def __str__(self):
-        return "Nonogram tile: " + self.status
\ No newline at end of file
+        return "Nonogram tile: " + self.status
+
+class NonogramTile(NonogramTileMixin, Tile):
+    def __init__(self, parent, row=0, col=0, colorUnknown="white", colorNo="gray75", colorYes="black", status="unknown"):
+        Tile.__init__(self, parent, row=row, col=col, color=colorUnknown)
+        self.initStatus(colorUnknown, colorNo, colorYes, status)
+
+class NonogramCanvasTile(NonogramTileMixin, CanvasTile):
+    def __init__(self, parent, row=0, col=0, colorUnknown="white", colorNo="gray75", colorYes="black", status="unknown"):
+        CanvasTile.__init__(self, parent, row=row, col=col, color=colorUnknown)
+        self.initStatus(colorUnknown, colorNo, colorYes, status)
@@ -3,8 +3,8 @@ Filename: nonogram_tile_grid.py
 Date Created: 5/4/2021
 """
 
-from utils import TileGrid, emptyCallback
-from nonogram_tile import NonogramTile
+from utils import TileGrid, CanvasTileGrid, emptyCallback
+from nonogram_tile import NonogramTile, NonogramCanvasTile
 
 class DefaultSettings:
     unknownColor = 'white'
@@ -12,17 +12,12 @@ class DefaultSettings:
     yesColor="black"
 
 
-class NonogramTileGrid(TileGrid):
-    def __init__(self, parent,
-                 rows=5, cols=5,
-                 tileMinWidth=50, tileMinHeight=50,
-                 colorUnknown=DefaultSettings.unknownColor,
-                 colorNo=DefaultSettings.noColor,
-                 colorYes=DefaultSettings.yesColor,
-                 tileChangeCallback=emptyCallback):
-
-        TileGrid.__init__(self, parent, NonogramTile, rows=rows, cols=cols,
-                          tileMinWidth=tileMinWidth, tileMinHeight=tileMinHeight)
+class NonogramTileGridMixin:
+    """
+    The behaviour of a grid of nonogram tiles, shared by the widget-based NonogramTileGrid and the canvas-based
+    NonogramCanvasTileGrid. It must be combined with TileGrid or CanvasTileGrid.
+    """
+    def configureNonogramTiles(self, colorUnknown, colorNo, colorYes, tileChangeCallback):
         for tile in self.tiles:
             tile.configureColor("unknown", colorUnknown)
             tile.configureColor("no", colorNo)
@@ -57,6 +52,36 @@ class NonogramTileGrid(TileGrid):
     #     return answerKey
 
     def resetGrid(self):
-        for row in range(self.height):
-            for col in range(self.width):
-                self.getTile(row, col).setStatus("unknown")
\ No newline at end of file
+        with self.batchUpdates():
+            for row in range(self.height):
+                for col in range(self.width):
+                    self.getTile(row, col).setStatus("unknown")
+
+
+class NonogramTileGrid(NonogramTileGridMixin, TileGrid):
+    def __init__(self, parent,
+                 rows=5, cols=5,
+                 tileMinWidth=50, tileMinHeight=50,
+                 colorUnknown=DefaultSettings.unknownColor,
+                 colorNo=DefaultSettings.noColor,
+                 colorYes=DefaultSettings.yesColor,
+                 tileChangeCallback=emptyCallback):
+
+        TileGrid.__init__(self, parent, NonogramTile, rows=rows, cols=cols,
+                          tileMinWidth=tileMinWidth, tileMinHeight=tileMinHeight)
+        self.configureNonogramTiles(colorUnknown, colorNo, colorYes, tileChangeCallback)
+
+
+class NonogramCanvasTileGrid(NonogramTileGridMixin, CanvasTileGrid):
+    """ A NonogramTileGrid drawn on a single canvas, for boards too large to make a widget per tile """
+    def __init__(self, parent,
+                 rows=5, cols=5,
+                 tileMinWidth=50, tileMinHeight=50,
+                 colorUnknown=DefaultSettings.unknownColor,
+                 colorNo=DefaultSettings.noColor,
+                 colorYes=DefaultSettings.yesColor,
+                 tileChangeCallback=emptyCallback):
+
+        CanvasTileGrid.__init__(self, parent, NonogramCanvasTile, rows=rows, cols=cols,
+                                tileMinWidth=tileMinWidth, tileMinHeight=tileMinHeight)
+        self.configureNonogramTiles(colorUnknown, colorNo, colorYes, tileChangeCallback)
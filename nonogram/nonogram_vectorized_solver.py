@@ -0,0 +1,56 @@
+"""
+Filename: nonogram_vectorized_solver.py
+Date Created: 10/18/2026
+"""
+
+from collections import deque
+
+import numpy as np
+
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_line_solver import solveLinesVectorized, BOARD_NUMBER_TO_STATUS
+
+
+class NonogramVectorizedSolver(NonogramPropagationSolver):
+    """
+    A NonogramPropagationSolver that line solves in sweeps with NumPy. Rather than solving queued lines one at a time,
+    every row is solved in one batch of array operations over the rows' placement matrices, then every column, and so
+    on until a sweep deduces nothing new. Search, budgets and callbacks work exactly as in NonogramPropagationSolver.
+    """
+    def propagate(self, checkBudget=True):
+        """
+        Line solves every row whenever a row is queued, then every column whenever a column is queued, until no more
+        cells can be deduced.
+        :param checkBudget: stop early if the budget of the current resume runs out
+        :return: True if the queue was emptied, False if some line has no legal placement (the queue is then cleared),
+        or None if the budget of the current resume ran out first
+        """
+        while self.queue:
+            if checkBudget and self.isOutOfBudget():
+                return None
+            isRow = len(self.queuedRows) > 0
+            grid = np.array([self.board.getRow(row) for row in range(self.board.height)])
+            if isRow:
+                lines = grid
+                solved = solveLinesVectorized(self.board.rowClues, lines)
+                self.queuedRows.clear()
+            else:
+                lines = grid.T
+                solved = solveLinesVectorized(self.board.colClues, lines)
+                self.queuedCols.clear()
+            self.queue = deque(item for item in self.queue if item[0] != isRow)
+            self.numLineSolves += len(lines)
+
+            if solved is None:
+                self.clearQueue()
+                return False
+
+            for index, i in np.argwhere(solved != lines).tolist():
+                status = BOARD_NUMBER_TO_STATUS[solved[index, i]]
+                if isRow:
+                    self.assign(index, i, status)
+                    self.queueLine(False, i)
+                else:
+                    self.assign(i, index, status)
+                    self.queueLine(True, i)
+        return True
@@ -0,0 +1,90 @@
+"""
+Filename: test_nonogram_board.py
+Date Created: 10/18/2026
+"""
+
+import os
+import random
+import unittest
+
+import numpy as np
+
+from nonogram_board import NonogramBoard, cluesFromAnswerKey
+from nonogram_puzzle_file import PUZZLE_DIR, readPuzzleFile
+
+STATUSES = ["unknown", "no", "yes"]
+
+
+def trackedCounts(board):
+    return (board.numMismatches, board.numErrors, board.rowMismatches, board.colMismatches, board.rowErrors,
+            board.colErrors, board.wrongRows, board.wrongCols)
+
+
+class AnswerKeyTrackingTest(unittest.TestCase):
+    def testTrackedCountsMatchAFullRecount(self):
+        rng = random.Random(3)
+        answerKey = np.random.default_rng(3).random((6, 7)) < 0.5
+        board = NonogramBoard.initFromClues(*cluesFromAnswerKey(answerKey))
+        board.answerKey = answerKey.copy()
+        board.trackAnswerKey()
+        for i in range(500):
+            row, col = rng.randrange(6), rng.randrange(7)
+            if rng.random() < 0.2:
+                board.setAnswerCell(row, col, rng.random() < 0.5)
+            else:
+                board.updateBoard(row, col, rng.choice(STATUSES))
+            recounted = board.copy()  # Copies count everything from scratch
+            self.assertEqual(trackedCounts(board), trackedCounts(recounted))
+            self.assertEqual(board.isSolved(), np.array_equal(board.board == 2, board.answerKey))
+
+    def testSolvingTheBoard(self):
+        answerKey = np.array([[True, False], [True, True]])
+        board = NonogramBoard.initFromClues(*cluesFromAnswerKey(answerKey))
+        board.answerKey = answerKey
+        board.trackAnswerKey()
+        self.assertFalse(board.isSolved())
+        board.updateBoard(0, 1, "yes")
+        self.assertEqual(board.getWrongLines(), ([0], [1]))
+        board.updateBoard(0, 1, "no")
+        for row, col in [(0, 0), (1, 0), (1, 1)]:
+            board.updateBoard(row, col, "yes")
+        self.assertTrue(board.isSolved())
+        self.assertEqual(board.getWrongLines(), ([], []))
+        board.resetBoard()
+        self.assertEqual(board.numMismatches, 3)
+        self.assertEqual(board.numErrors, 0)
+
+
+class FindSolutionsTest(unittest.TestCase):
+    def testUniquePuzzleSetsTheAnswerKey(self):
+        rowClues, colClues = readPuzzleFile(os.path.join(PUZZLE_DIR, "lion.puz"))
+        board = NonogramBoard.initFromClues(rowClues, colClues)
+        self.assertEqual(board.initializeAnswerKeyFromClues(), 1)
+        self.assertTrue(board.tracking)
+        self.assertEqual(cluesFromAnswerKey(board.answerKey), (rowClues, colClues))
+
+    def testAmbiguousPuzzleKeepsTheAnswerKey(self):
+        board = NonogramBoard.initFromClues([[1], [1]], [[1], [1]])
+        self.assertEqual(board.initializeAnswerKeyFromClues(), 2)
+        self.assertFalse(board.tracking)
+        self.assertFalse(board.answerKey.any())
+
+    def testSearchIsCachedUntilTheCluesChange(self):
+        board = NonogramBoard.initFromClues([[1], [1]], [[1], [1]])
+        result = board.findSolutions()
+        self.assertIs(board.findSolutions(), result)
+        board.answerKey = np.array([[True, False], [False, True]])
+        board.setAnswerCell(0, 1, True)
+        self.assertEqual(board.findSolutions()[0], 1)
+
+    def testSearchThatRunsOutOfBudgetIsUnknown(self):
+        rowClues, colClues = readPuzzleFile(os.path.join(PUZZLE_DIR, "hard_maybe_unique.puz"))
+        board = NonogramBoard.initFromClues(rowClues, colClues)
+        self.assertIsNone(board.findSolutions(maxSteps=10)[0])
+        self.assertIsNone(board.initializeAnswerKeyFromClues(maxSteps=10))
+        self.assertFalse(board.tracking)
+        self.assertEqual(board.findSolutions()[0], 2)  # The search that gave up was not kept
+
+
+if __name__ == "__main__":
+    unittest.main()
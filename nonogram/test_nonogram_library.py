@@ -0,0 +1,105 @@
+"""
+Filename: test_nonogram_library.py
+Date Created: 10/18/2026
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import nonogram_library
+from nonogram_board import cluesFromAnswerKey
+from nonogram_library import PuzzleLibrary, libraryToPuz, puzToLibrary, writeLibrary
+from nonogram_puzzle_file import PUZZLE_DIR, findPuzzleFiles, readPuzzleFile
+
+
+def randomPuzzles(count):
+    """
+    :return: list of (name, rowClues, colClues, solution) of random grids of various sizes, every other one without a
+    stored solution
+    """
+    rng = np.random.default_rng(5)
+    puzzles = []
+    for i in range(count):
+        solution = rng.random(tuple(rng.integers(1, 40, size=2))) < rng.uniform(0, 1)
+        rowClues, colClues = cluesFromAnswerKey(solution)
+        puzzles.append(("puzzle " + str(i), rowClues, colClues, solution if i % 2 == 0 else None))
+    return puzzles
+
+
+class PuzzleLibraryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "puzzles.lib")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testRoundTrip(self):
+        puzzles = randomPuzzles(50)
+        self.assertEqual(writeLibrary(self.path, iter(puzzles)), 50)
+        with PuzzleLibrary(self.path) as library:
+            self.assertEqual(len(library), 50)
+            for index, (name, rowClues, colClues, solution) in enumerate(puzzles):
+                readName, readRowClues, readColClues, readSolution = library.readRecord(index)
+                self.assertEqual((readName, readRowClues, readColClues), (name, rowClues, colClues))
+                if solution is None:
+                    self.assertIsNone(readSolution)
+                else:
+                    np.testing.assert_array_equal(readSolution, solution)
+                self.assertEqual(library.indexOf(name), index)
+                self.assertEqual(library.getPuzzleByName(name), (rowClues, colClues))
+            self.assertEqual([record[0] for record in library], [puzzle[0] for puzzle in puzzles])
+            with self.assertRaises(KeyError):
+                library.indexOf("missing")
+            with self.assertRaises(IndexError):
+                library.getPuzzle(50)
+
+    def testEmptyLibrary(self):
+        writeLibrary(self.path, [])
+        with PuzzleLibrary(self.path) as library:
+            self.assertEqual(len(library), 0)
+            with self.assertRaises(KeyError):
+                library.indexOf("missing")
+
+    def testDuplicateNamesAndHashCollisions(self):
+        original = nonogram_library.hashName
+        nonogram_library.hashName = lambda name: 0  # Every name collides
+        try:
+            writeLibrary(self.path, [(name, [[1]], [[1]], None) for name in ["a", "b", "a", "c"]])
+            with PuzzleLibrary(self.path) as library:
+                self.assertEqual([library.indexOf(name) for name in ["a", "b", "c"]], [0, 1, 3])
+                with self.assertRaises(KeyError):
+                    library.indexOf("d")
+        finally:
+            nonogram_library.hashName = original
+
+    def testNotALibrary(self):
+        for contents in [b"", b"NGLB", b"Rows:\n" * 10]:
+            with open(self.path, "wb") as f:
+                f.write(contents)
+            with self.assertRaises(ValueError):
+                PuzzleLibrary(self.path)
+
+    def testPuzFilesRoundTrip(self):
+        puzzleFiles = findPuzzleFiles([PUZZLE_DIR])
+        self.assertEqual(puzToLibrary(puzzleFiles, self.path), len(puzzleFiles))
+        outDirectory = os.path.join(self.directory, "out")
+        self.assertEqual(libraryToPuz(self.path, outDirectory), len(puzzleFiles))
+        for puzzleFile in puzzleFiles:
+            unpacked = os.path.join(outDirectory, os.path.basename(puzzleFile))
+            self.assertEqual(readPuzzleFile(unpacked), readPuzzleFile(puzzleFile))
+
+    def testUnpackingStaysInTheDirectory(self):
+        writeLibrary(self.path, [("../escaped", [[1]], [[1]], None), ("/tmp/absolute", [[1]], [[1]], None)])
+        outDirectory = os.path.join(self.directory, "out")
+        libraryToPuz(self.path, outDirectory)
+        self.assertEqual(sorted(os.listdir(outDirectory)), ["absolute.puz", "escaped.puz"])
+        self.assertFalse(os.path.exists(os.path.join(self.directory, "escaped.puz")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Filename: test_nonogram_line_solver.py
+Date Created: 10/18/2026
+"""
+
+import random
+import unittest
+from itertools import product
+
+import numpy as np
+
+from nonogram_board import runLengthClues
+from nonogram_line_solver import (NO, UNKNOWN, YES, countPlacements, normalizeClue, solveLine, solveLineMasks,
+                                  solveLinesVectorized, solveLineVectorized)
+
+
+def lineClue(fill):
+    return runLengthClues(np.array([fill], dtype=bool))[0]
+
+
+def bruteForce(clue, line):
+    """
+    Solves a line by trying every way of filling it
+    :return: (the line with the forced cells filled in or None, number of fillings that match the clue and the line)
+    """
+    matches = []
+    for fill in product([False, True], repeat=len(line)):
+        if all(status == UNKNOWN or (status == YES) == filled for status, filled in zip(line, fill)):
+            if normalizeClue(lineClue(fill)) == normalizeClue(clue):
+                matches.append(fill)
+    if not matches:
+        return None, 0
+    solved = list(line)
+    for i in range(len(line)):
+        values = {fill[i] for fill in matches}
+        if values == {True}:
+            solved[i] = YES
+        elif values == {False}:
+            solved[i] = NO
+    return solved, len(matches)
+
+
+def randomLine(rng, length):
+    """
+    :return: (clue, line) where the clue comes from a random filling, and some cells of the line are known. Known cells
+    are usually taken from the filling, but are sometimes random, so that some lines have no legal placement.
+    """
+    fill = [rng.random() < 0.5 for i in range(length)]
+    clue = lineClue(fill)
+    noisy = rng.random() < 0.3
+    line = []
+    for filled in fill:
+        if rng.random() < 0.6:
+            line.append(UNKNOWN)
+        elif noisy and rng.random() < 0.3:
+            line.append(rng.choice([NO, YES]))
+        else:
+            line.append(YES if filled else NO)
+    return clue, line
+
+
+def toMasks(line):
+    filled = sum(1 << i for i, status in enumerate(line) if status == YES)
+    empty = sum(1 << i for i, status in enumerate(line) if status == NO)
+    return filled, empty
+
+
+def fromMasks(filled, empty, length):
+    return [YES if filled >> i & 1 else NO if empty >> i & 1 else UNKNOWN for i in range(length)]
+
+
+class LineSolverTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        cls.cases = [randomLine(rng, rng.randint(1, 10)) for i in range(400)]
+        cls.expected = [bruteForce(clue, line) for clue, line in cls.cases]
+
+    def testSolveLine(self):
+        for (clue, line), (solved, numPlacements) in zip(self.cases, self.expected):
+            self.assertEqual(solveLine(clue, line), solved, (clue, line))
+
+    def testCountPlacements(self):
+        for (clue, line), (solved, numPlacements) in zip(self.cases, self.expected):
+            self.assertEqual(countPlacements(clue, line), numPlacements, (clue, line))
+
+    def testSolveLineVectorized(self):
+        for (clue, line), (solved, numPlacements) in zip(self.cases, self.expected):
+            self.assertEqual(solveLineVectorized(clue, line), solved, (clue, line))
+
+    def testSolveLineMasks(self):
+        for (clue, line), (solved, numPlacements) in zip(self.cases, self.expected):
+            result = solveLineMasks(tuple(normalizeClue(clue)), *toMasks(line), len(line))
+            if result is not None:
+                result = fromMasks(*result, len(line))
+            self.assertEqual(result, solved, (clue, line))
+
+    def testSolveLinesVectorized(self):
+        byLength = {}
+        for (clue, line), (solved, numPlacements) in zip(self.cases, self.expected):
+            byLength.setdefault(len(line), []).append((clue, line, solved))
+        for length, cases in byLength.items():
+            # Solved as batches of a few lines, since a batch fails as a whole if any of its lines has no placement
+            for first in range(0, len(cases), 3):
+                batch = cases[first:first + 3]
+                result = solveLinesVectorized([clue for clue, line, solved in batch],
+                                              np.array([line for clue, line, solved in batch]))
+                if any(solved is None for clue, line, solved in batch):
+                    self.assertIsNone(result, batch)
+                else:
+                    self.assertEqual(result.tolist(), [solved for clue, line, solved in batch], batch)
+
+    def testLongLinesMatchSolveLine(self):
+        # Too long to brute force. Many of these clues have more placements than the vectorized solvers stack, and fall
+        # back to solveLine.
+        rng = random.Random(2)
+        for length in [30, 45]:
+            cases = [randomLine(rng, length) for i in range(40)]
+            for clue, line in cases:
+                self.assertEqual(solveLineVectorized(clue, line), solveLine(clue, line), (clue, line))
+            solvable = [(clue, line) for clue, line in cases if solveLine(clue, line) is not None]
+            result = solveLinesVectorized([clue for clue, line in solvable], np.array([line for clue, line in solvable]))
+            self.assertEqual(result.tolist(), [solveLine(clue, line) for clue, line in solvable])
+
+    def testEmptyClue(self):
+        self.assertEqual(solveLine([0], [UNKNOWN] * 3), [NO] * 3)
+        self.assertIsNone(solveLine([0], [UNKNOWN, YES, UNKNOWN]))
+        self.assertEqual(solveLineMasks((), 0, 0, 3), (0, 0b111))
+        self.assertIsNone(solveLineMasks((), 0b10, 0, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""
+Filename: test_nonogram_probing.py
+Date Created: 10/18/2026
+"""
+
+import os
+import unittest
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_puzzle_file import PUZZLE_DIR, readPuzzleFile
+from nonogram_vectorized_solver import NonogramVectorizedSolver
+
+
+def loadBoard(name):
+    rowClues, colClues = readPuzzleFile(os.path.join(PUZZLE_DIR, name + ".puz"))
+    return NonogramBitBoard.initFromClues(rowClues, colClues)
+
+
+class ProbingTest(unittest.TestCase):
+    def countWithProbing(self, solverClass, name, limit):
+        solver = solverClass(loadBoard(name), probing=True)
+        solver.verbose = False
+        return solver.countSolutions(limit)
+
+    def testVectorizedSolverProbes(self):
+        allSolutions = NonogramPropagationSolver(loadBoard("hard_maybe_unique")).countSolutions(10000)[1]
+        numSolutions, solutions = self.countWithProbing(NonogramVectorizedSolver, "hard_maybe_unique", 20)
+        self.assertEqual(numSolutions, 20)
+        found = {solution.tobytes() for solution in solutions}
+        self.assertEqual(len(found), 20)
+        self.assertTrue(found <= {solution.tobytes() for solution in allSolutions})
+
+    def testProbingFindsEverySolution(self):
+        numSolutions, solutions = self.countWithProbing(NonogramPropagationSolver, "hard_maybe_unique", 10000)
+        self.assertEqual(numSolutions, 1514)
+        self.assertEqual(len({solution.tobytes() for solution in solutions}), 1514)
+
+    def testProbingSolvesUniquePuzzleWithoutGuessing(self):
+        solver = NonogramVectorizedSolver(loadBoard("lion"), probing=True)
+        solver.verbose = False
+        self.assertTrue(solver.solvePuzzle())
+        self.assertEqual(solver.numGuesses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Filename: test_nonogram_puzzle_file.py
+Date Created: 10/18/2026
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from nonogram_puzzle_file import (PUZZLE_DIR, PuzzleFileError, findPuzzleFiles, iterPuzzles, readPuzzleFile,
+                                  writePuzzleFile)
+
+SMALL_PUZZLE = """Rows:
+2
+Cols:
+3
+Row clues:
+1 1
+2
+Col clues:
+1
+1
+2
+"""
+
+
+class PuzzleFileTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def testBundledPuzzlesRoundTrip(self):
+        for puzzleFile in findPuzzleFiles([PUZZLE_DIR]):
+            rowClues, colClues = readPuzzleFile(puzzleFile)
+            path = os.path.join(self.directory, os.path.basename(puzzleFile))
+            writePuzzleFile(path, rowClues, colClues)
+            self.assertEqual(readPuzzleFile(path), (rowClues, colClues), puzzleFile)
+
+    def testEmptyLinesRoundTrip(self):
+        path = os.path.join(self.directory, "empty.puz")
+        writePuzzleFile(path, [[0], [2]], [[1], [1], [0]])
+        self.assertEqual(readPuzzleFile(path), ([[0], [2]], [[1], [1], [0]]))
+
+    def testSeveralPuzzlesInOneStream(self):
+        puzzles = list(iterPuzzles((SMALL_PUZZLE + "\n\n" + SMALL_PUZZLE.lower()).splitlines()))
+        self.assertEqual(puzzles, [([[1, 1], [2]], [[1], [1], [2]])] * 2)
+
+    def testMoreThanOnePuzzleInAFile(self):
+        path = os.path.join(self.directory, "two.puz")
+        with open(path, "w") as f:
+            f.write(SMALL_PUZZLE + SMALL_PUZZLE)
+        with self.assertRaises(PuzzleFileError):
+            readPuzzleFile(path)
+
+    def assertMalformed(self, text, lineNumber, message):
+        with self.assertRaises(PuzzleFileError) as context:
+            list(iterPuzzles(text.splitlines(), "bad.puz"))
+        self.assertEqual(context.exception.lineNumber, lineNumber)
+        self.assertIn(message, str(context.exception))
+
+    def testMalformedPuzzles(self):
+        lines = SMALL_PUZZLE.splitlines()
+
+        def replaced(lineNumber, line):
+            return "\n".join(lines[:lineNumber - 1] + [line] + lines[lineNumber:])
+
+        self.assertMalformed(replaced(1, "Columns:"), 1, 'expected "Rows:"')
+        self.assertMalformed(replaced(2, "two"), 2, "expected the number of rows")
+        self.assertMalformed(replaced(4, "0"), 4, "must be positive")
+        self.assertMalformed(replaced(6, "1 x"), 6, "expected a row clue")
+        self.assertMalformed(replaced(6, "2 1"), 6, "needs 4 cells")
+        self.assertMalformed(replaced(7, "-1"), 7, "negative block")
+        self.assertMalformed(replaced(11, "1"), 1, "the row clues fill 4 cells, but the col clues fill 3")
+        self.assertMalformed("\n".join(lines[:9]), None, "unexpected end of file")
+
+
+if __name__ == "__main__":
+    unittest.main()
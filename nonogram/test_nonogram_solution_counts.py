@@ -0,0 +1,116 @@
+"""
+Filename: test_nonogram_solution_counts.py
+Date Created: 10/18/2026
+"""
+
+import unittest
+from itertools import product
+
+import numpy as np
+
+from nonogram_bit_board import NonogramBitBoard
+from nonogram_board import NonogramBoard, cluesFromAnswerKey, runLengthClues
+from nonogram_propagation_solver import NonogramPropagationSolver
+from nonogram_sat_solver import NonogramSatSolver
+from nonogram_solver import NonogramSolver
+from nonogram_vectorized_solver import NonogramVectorizedSolver
+
+
+def bruteForceSolutions(rowClues, colClues):
+    """
+    Finds every solution by trying every filling of each row that matches its clue, in every combination
+    :return: set of solutions, each as the bytes of a boolean array
+    """
+    def cluesOfFillings(length):
+        fillings = list(product([False, True], repeat=length))
+        return dict(zip(fillings, runLengthClues(np.array(fillings, dtype=bool))))
+
+    rowFillings = cluesOfFillings(len(colClues))
+    colFillings = cluesOfFillings(len(rowClues))
+    rowOptions = [[filling for filling, clue in rowFillings.items() if clue == rowClue] for rowClue in rowClues]
+    solutions = set()
+    for rows in product(*rowOptions):
+        if all(colFillings[col] == colClue for col, colClue in zip(zip(*rows), colClues)):
+            solutions.add(np.array(rows, dtype=bool).tobytes())
+    return solutions
+
+
+def randomPuzzles(seed, count, size):
+    """
+    :return: list of (rowClues, colClues) of random grids. Every fourth puzzle takes its col clues from another grid
+    with the same number of filled cells when there is one, so that some puzzles have no solution.
+    """
+    rng = np.random.default_rng(seed)
+    grids = [rng.random((size, size)) < rng.uniform(0.3, 0.7) for i in range(count)]
+    puzzles = []
+    for i, grid in enumerate(grids):
+        rowClues, colClues = cluesFromAnswerKey(grid)
+        if i % 4 == 3:
+            others = [other for other in grids if other.sum() == grid.sum() and other is not grid]
+            if others:
+                colClues = cluesFromAnswerKey(others[0])[1]
+        puzzles.append((rowClues, colClues))
+    return puzzles
+
+
+class SolutionCountTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.puzzles = randomPuzzles(7, 40, 5) + randomPuzzles(8, 10, 6)
+        cls.expected = [bruteForceSolutions(rowClues, colClues) for rowClues, colClues in cls.puzzles]
+
+    def checkCounts(self, createSolver, boardClass=NonogramBoard):
+        for (rowClues, colClues), expected in zip(self.puzzles, self.expected):
+            solver = createSolver(boardClass.initFromClues(rowClues, colClues))
+            solver.verbose = False
+            numSolutions, solutions = solver.countSolutions(100)
+            self.assertEqual(numSolutions, len(expected), (rowClues, colClues))
+            self.assertEqual({solution.tobytes() for solution in solutions}, expected, (rowClues, colClues))
+
+    def testBruteForceFindsSomeUnsolvablePuzzles(self):
+        self.assertTrue(any(len(expected) == 0 for expected in self.expected))
+        self.assertTrue(any(len(expected) > 1 for expected in self.expected))
+
+    def testPropagationSolver(self):
+        self.checkCounts(NonogramPropagationSolver)
+        self.checkCounts(NonogramPropagationSolver, NonogramBitBoard)
+
+    def testBranchingHeuristics(self):
+        for branching in ["mostConstrainedLine", "fewestPlacements"]:
+            self.checkCounts(lambda board: NonogramPropagationSolver(board, branching=branching))
+
+    def testProbingSolver(self):
+        self.checkCounts(lambda board: NonogramPropagationSolver(board, probing=True), NonogramBitBoard)
+
+    def testVectorizedSolver(self):
+        self.checkCounts(NonogramVectorizedSolver)
+
+    def testSatSolver(self):
+        self.checkCounts(lambda board: NonogramSatSolver(board, useExternal=False))
+
+    def testSatSolverMatchesPropagationOnLargerPuzzles(self):
+        # Too big to brute force, but big enough that the SAT solver has to learn clauses and restart
+        for rowClues, colClues in randomPuzzles(9, 8, 12):
+            propagation = NonogramPropagationSolver(NonogramBitBoard.initFromClues(rowClues, colClues))
+            propagation.verbose = False
+            expected = {solution.tobytes() for solution in propagation.countSolutions(100)[1]}
+            sat = NonogramSatSolver(NonogramBoard.initFromClues(rowClues, colClues), useExternal=False)
+            sat.verbose = False
+            self.assertEqual({solution.tobytes() for solution in sat.countSolutions(100)[1]}, expected,
+                             (rowClues, colClues))
+
+    def testBacktrackingSolver(self):
+        for maxNogoods in [NonogramSolver.maxNogoods, 2]:  # 2 forces old nogoods to be forgotten
+            for (rowClues, colClues), expected in zip(self.puzzles, self.expected):
+                board = NonogramBoard.initFromClues(rowClues, colClues)
+                solver = NonogramSolver(board)
+                solver.verbose = False
+                solver.maxNogoods = maxNogoods
+                solved = solver.solvePuzzle()
+                self.assertEqual(solved, len(expected) > 0, (rowClues, colClues))
+                if solved:
+                    self.assertIn((board.board == 2).tobytes(), expected, (rowClues, colClues))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,6 +4,7 @@ Date Created: 4/24/2021
 """
 
 import tkinter as tk
+from contextlib import contextmanager
 
 class Tile(tk.Frame):
     """
@@ -18,6 +19,9 @@ class Tile(tk.Frame):
         self.text = text
         self.row = row
         self.col = col
+        self.tileGrid = None  # Set by the TileGrid that owns this tile, which batches its repaints
+        self.paintedColor = color  # What the label currently shows
+        self.paintedText = ""
 
         self.label.bind("<Button-1>", self.onLeftClick)
         self.label.bind("<Button-2>", self.onRightClick)
@@ -46,12 +50,107 @@ class Tile(tk.Frame):
         return "Color: " + self.color + ", text:  " + self.text
 
     def refresh(self):
-        self.label.configure(bg=self.color, text=self.text)
+        """ Repaints the tile, or marks it to be repainted with the next batch if it belongs to a TileGrid """
+        if self.tileGrid is None:
+            self.paint()
+        else:
+            self.tileGrid.markDirty(self)
+
+    def paint(self):
+        """ Pushes the color and text to the label, unless the label already shows them """
+        if self.color != self.paintedColor or self.text != self.paintedText:
+            self.label.configure(bg=self.color, text=self.text)
+            self.paintedColor = self.color
+            self.paintedText = self.text
 
     def configureCallback(self, callbackFunc):
         self.callbackFunction = callbackFunc
 
-class TileGrid(tk.Frame):
+class TileGridMixin:
+    """
+    Behaviour shared by TileGrid and CanvasTileGrid. Tiles do not repaint themselves as soon as they change: they are
+    marked dirty, and every dirty tile is painted in one pass when Tk is next idle. Tiles that end up unchanged are
+    not repainted at all.
+    """
+    def initBatching(self):
+        self.dirtyTiles = set()
+        self.batchDepth = 0  # Number of open batchUpdates blocks
+        self.flushScheduled = False
+
+    def getTile(self, row, col):
+        index = row * self.width + col
+        return self.tiles[index]
+
+    def getMinWidth(self):
+        """
+        Returns the minimum width of the entire grid.
+        :return: minimum width of the grid (pix)
+        """
+        return self.tileMinWidth*self.width
+
+    def getMinHeight(self):
+        """
+        Returns the minimum height of the entire grid.
+        :return: minimum height of the grid (pix)
+        """
+        return self.tileMinHeight*self.height
+
+    def refresh(self):
+        """
+        Refreshes every tile in the grid
+        """
+        for tile in self.tiles:
+            tile.refresh()
+
+    def refreshTile(self, row, col):
+        """
+        Refreshes a specific tile in the grid.
+        :param row: Row of the tile to refresh
+        :param col: Column of the tile to refresh
+        """
+        self.getTile(row, col).refresh()
+
+    def setClickable(self, clickable):
+        self.clickable = clickable
+        for tile in self.tiles:
+            tile.clickable = clickable
+
+    def markDirty(self, tile):
+        """
+        Marks a tile to be repainted with the next batch, and schedules the batch if one isn't already scheduled.
+        :param tile: the tile to repaint
+        """
+        self.dirtyTiles.add(tile)
+        if self.batchDepth == 0 and not self.flushScheduled:
+            self.flushScheduled = True
+            self.after_idle(self.flush)
+
+    def flush(self):
+        """
+        Paints every dirty tile now
+        """
+        self.flushScheduled = False
+        dirtyTiles = self.dirtyTiles
+        self.dirtyTiles = set()
+        for tile in dirtyTiles:
+            tile.paint()
+
+    @contextmanager
+    def batchUpdates(self):
+        """
+        Context manager for bulk edits. No batch is scheduled until the outermost block exits, so every tile changed
+        inside the block is painted in a single pass.
+        """
+        self.batchDepth += 1
+        try:
+            yield self
+        finally:
+            self.batchDepth -= 1
+            if self.batchDepth == 0 and self.dirtyTiles and not self.flushScheduled:
+                self.flushScheduled = True
+                self.after_idle(self.flush)
+
+class TileGrid(TileGridMixin, tk.Frame):
     """
     A TileGrid is a grid of tiles, with the desired number of rows and columns.
     You can pass in any type of Tile object you want, to dictate how the grid behaves
@@ -74,6 +173,7 @@ class TileGrid(tk.Frame):
         for i in range(cols):
             self.columnconfigure(i, minsize=tileMinHeight, weight=1)
 
+        self.initBatching()
         self.tiles = []
         self.createTiles()
 
@@ -82,45 +182,145 @@ class TileGrid(tk.Frame):
             for col in range(self.width):
                 tile = self.tileClass(self, row=row, col=col)
                 tile.grid(row=row, column=col, sticky="nsew")
+                tile.tileGrid = self
                 self.tiles.append(tile)
 
-    def getTile(self, row, col) -> Tile:
-        index = row * self.width + col
-        return self.tiles[index]
 
-    def getMinWidth(self):
-        """
-        Returns the minimum width of the entire grid.
-        :return: minimum width of the grid (pix)
-        """
-        return self.tileMinWidth*self.width
 
-    def getMinHeight(self):
-        """
-        Returns the minimum height of the entire grid.
-        :return: minimum height of the grid (pix)
-        """
-        return self.tileMinHeight*self.height
+
+class CanvasTile:
+    """
+    A CanvasTile behaves like a Tile, but rather than being its own widget, it is a rectangle and a text item drawn on
+    the canvas of a CanvasTileGrid. It has the same methods as Tile, so Tile subclasses' behaviour can be reused on it.
+    """
+    def __init__(self, parent, row=0, col=0, color='grey', text=''):
+        self.canvas = parent
+        self.color = color
+        self.text = text
+        self.row = row
+        self.col = col
+        self.tileGrid = None  # Set by the CanvasTileGrid that owns this tile, which batches its repaints
+        self.paintedColor = color  # What the canvas currently shows
+        self.paintedText = text
+
+        x0, y0, x1, y1 = parent.getTileBounds(row, col)
+        self.rectangle = parent.create_rectangle(x0, y0, x1, y1, fill=color, outline="gray50")
+        self.textItem = parent.create_text((x0 + x1) / 2, (y0 + y1) / 2, text=text)
+
+        self.clickable = True
+        self.callbackFunction = emptyCallback  # Declare the callback function, but leave it empty
+
+    def setColor(self, color):
+        self.color = color
+        self.refresh()
+
+    def setText(self, text):
+        self.text = text
+        self.refresh()
+
+    def onLeftClick(self, arg):
+        if self.clickable:
+            self.callbackFunction(self.row, self.col)
+
+    def onRightClick(self, arg):
+        if self.clickable:
+            self.callbackFunction(self.row, self.col)
+
+    def __str__(self):
+        return "Color: " + self.color + ", text:  " + self.text
 
     def refresh(self):
+        """ Repaints the tile, or marks it to be repainted with the next batch if it belongs to a CanvasTileGrid """
+        if self.tileGrid is None:
+            self.paint()
+        else:
+            self.tileGrid.markDirty(self)
+
+    def paint(self):
+        """ Pushes the color and text to the canvas items, unless they already show them """
+        if self.color != self.paintedColor:
+            self.canvas.itemconfigure(self.rectangle, fill=self.color)
+            self.paintedColor = self.color
+        if self.text != self.paintedText:
+            self.canvas.itemconfigure(self.textItem, text=self.text)
+            self.paintedText = self.text
+
+    def configureCallback(self, callbackFunc):
+        self.callbackFunction = callbackFunc
+
+class CanvasTileGrid(TileGridMixin, tk.Canvas):
+    """
+    A CanvasTileGrid has the same interface as a TileGrid, but draws every tile on a single canvas instead of creating
+    widgets for each tile, which keeps large grids fast to create and resize. Clicks are mapped to the tile under the
+    mouse arithmetically. Pass in a CanvasTile (or a subclass of it) to dictate how the grid behaves.
+    """
+
+    def __init__(self, parent, tile_class=CanvasTile, rows=3, cols=3, tileMinWidth=100, tileMinHeight=100):
+        tk.Canvas.__init__(self, parent, width=cols*tileMinWidth, height=rows*tileMinHeight,
+                           highlightthickness=0, borderwidth=0)
+
+        self.parent = parent
+        self.tileClass = tile_class
+        self.height = rows
+        self.width = cols
+        self.tileMinWidth = tileMinWidth
+        self.tileMinHeight = tileMinHeight
+        self.tileWidth = tileMinWidth  # Current size of each tile, which grows as the canvas is resized
+        self.tileHeight = tileMinHeight
+        self.clickable = True
+
+        self.bind("<Button-1>", self.onLeftClick)
+        self.bind("<Button-2>", self.onRightClick)
+        self.bind("<Button-3>", self.onRightClick)
+        self.bind("<Configure>", self.onResize)
+
+        self.initBatching()
+        self.tiles = []
+        self.createTiles()
+
+    def createTiles(self):
+        for row in range(self.height):
+            for col in range(self.width):
+                tile = self.tileClass(self, row=row, col=col)
+                tile.tileGrid = self
+                self.tiles.append(tile)
+
+    def getTileBounds(self, row, col):
         """
-        Refreshes every tile in the grid
+        :return: (x0, y0, x1, y1) of the given tile on the canvas
         """
-        for tile in self.tiles:
-            tile.refresh()
+        return col*self.tileWidth, row*self.tileHeight, (col + 1)*self.tileWidth, (row + 1)*self.tileHeight
 
-    def refreshTile(self, row, col):
+    def getTileAt(self, x, y):
         """
-        Refreshes a specific tile in the grid.
-        :param row: Row of the tile to refresh
-        :param col: Column of the tile to refresh
+        Finds the tile under a point on the canvas.
+        :return: the tile, or None if the point is outside the grid
         """
-        self.getTile(row, col).refresh()
+        row = int(self.canvasy(y) // self.tileHeight)
+        col = int(self.canvasx(x) // self.tileWidth)
+        if 0 <= row < self.height and 0 <= col < self.width:
+            return self.getTile(row, col)
+        return None
+
+    def onLeftClick(self, event):
+        tile = self.getTileAt(event.x, event.y)
+        if tile is not None:
+            tile.onLeftClick(event)
+
+    def onRightClick(self, event):
+        tile = self.getTileAt(event.x, event.y)
+        if tile is not None:
+            tile.onRightClick(event)
+
+    def onResize(self, event):
+        """ Stretches every tile to fill the canvas, with a single scale of all the canvas items """
+        tileWidth = event.width / self.width
+        tileHeight = event.height / self.height
+        self.scale("all", 0, 0, tileWidth / self.tileWidth, tileHeight / self.tileHeight)
+        self.tileWidth = tileWidth
+        self.tileHeight = tileHeight
+
 
-    def setClickable(self, clickable):
-        self.clickable = clickable
-        for tile in self.tiles:
-            tile.clickable = clickable
 
 
 def emptyCallback(*args):